@@ -0,0 +1,92 @@
+"""
+Dynamic micro-batching for the model calls of concurrent requests.
+
+    ner_batcher = MicroBatcher(extract_entities_batch, "ner")
+    resume_data = await ner_batcher.submit(resume_text)
+
+submit() queues one item. A collector task takes the first queued item and
+keeps collecting until MICROBATCH_MAX_SIZE items or MICROBATCH_MAX_WAIT_MS
+have passed, whichever comes first. It then runs fn(items) once in the
+inference pool and hands each caller its own result. fn must map a list of
+items to a list of results in the same order.
+
+At low load a request waits at most MICROBATCH_MAX_WAIT_MS extra. Under load,
+up to INFERENCE_WORKERS batches run at once and new requests queue up behind
+them, so batches grow without adding more wait.
+"""
+import asyncio
+import os
+import time
+
+from app import metrics
+from app.workers import INFERENCE_WORKERS, run_inference
+
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "16"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "5"))
+
+
+class MicroBatcher:
+    def __init__(self, fn, name: str, max_batch_size: int = MICROBATCH_MAX_SIZE,
+                 max_wait_ms: float = MICROBATCH_MAX_WAIT_MS, max_concurrency: int = INFERENCE_WORKERS):
+        self.fn = fn
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrency = max_concurrency
+        self._loop = None
+        self._queue = None
+        self._collector = None
+
+    def _ensure_started(self):
+        # Bound to the running event loop; restarted if a new loop shows up (tests, reloads)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._collector.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._collector = loop.create_task(self._collect())
+
+    async def submit(self, item):
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _next_batch(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Callers that timed out or disconnected while queued are dropped
+        return [(item, future) for item, future in batch if not future.done()]
+
+    async def _collect(self):
+        slots = asyncio.Semaphore(self.max_concurrency)
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            await slots.acquire()
+            task = asyncio.create_task(self._run(batch))
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _run(self, batch: list):
+        metrics.observe("batch_size", len(batch), self.name)
+        try:
+            results = await run_inference(self.fn, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
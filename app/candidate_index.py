@@ -0,0 +1,314 @@
+import base64
+import fcntl
+import json
+import os
+import threading
+
+import faiss
+import numpy as np
+
+from app.skill_matcher import encode_skills, semantic_match
+from app.scoring import calculate_scores
+
+CANDIDATE_INDEX_DIR = os.getenv(
+    "CANDIDATE_INDEX_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_matcher", "candidate_index")
+)
+# Journal entries after which the next write folds them into a fresh snapshot
+CANDIDATE_JOURNAL_MAX = int(os.getenv("CANDIDATE_JOURNAL_MAX", "1000"))
+
+
+def _profile_vector(skills: list, embeddings=None):
+    """Mean of the L2-normalised skill embeddings, renormalised (cosine via inner product)"""
+    if embeddings is None:
+        embeddings = encode_skills(list(skills))
+    vectors = np.asarray(embeddings.cpu().numpy() if hasattr(embeddings, "cpu") else embeddings,
+                         dtype=np.float32)
+    vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    profile = vectors.mean(axis=0)
+    return profile / max(np.linalg.norm(profile), 1e-12)
+
+
+class CandidateIndex:
+    """
+    Persistent FAISS index of parsed resumes for "top-k candidates for this JD".
+
+    Each candidate is one vector (the mean of its skill embeddings) in an
+    IndexIDMap2 over an exact inner-product index. The skills and experience
+    needed to re-score a shortlist live in a JSON sidecar keyed by the same ids.
+
+    On disk the state is a snapshot (candidates.faiss + candidates.json) plus
+    an append-only journal (candidates.log, one JSON line per add/remove), so
+    a change costs one appended line. Every CANDIDATE_JOURNAL_MAX entries the
+    journal is folded into a new snapshot.
+
+    Several worker processes may share one directory. Writers serialise on an
+    flock'd lock file and catch up with other processes' changes before
+    writing; readers catch up when the snapshot or the journal has changed.
+    """
+
+    def __init__(self, directory: str = CANDIDATE_INDEX_DIR, dim: int = None):
+        self.directory = directory
+        self._index_path = os.path.join(directory, "candidates.faiss")
+        self._meta_path = os.path.join(directory, "candidates.json")
+        self._journal_path = os.path.join(directory, "candidates.log")
+        self._lock_path = os.path.join(directory, ".lock")
+        self._lock = threading.RLock()
+
+        self.index = None
+        self.dim = dim
+        self.candidates = {}   # candidate_id -> {"faiss_id", "skills", "experience", ...}
+        self._faiss_ids = {}   # faiss_id -> candidate_id
+        self._next_id = 0
+        self.version = 0       # bumped on every change, for caches derived from the pool
+        self._signature = None  # snapshot this process last read or wrote
+        self._journal_offset = 0   # journal bytes applied so far
+        self._journal_entries = 0
+
+        self.refresh()
+
+    def __len__(self):
+        self.refresh()
+        return len(self.candidates)
+
+    def _ensure_index(self, dim: int):
+        if self.index is None:
+            self.dim = dim
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    # ========== CROSS-PROCESS SYNC ==========
+    def _disk_signature(self):
+        try:
+            stat = os.stat(self._meta_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _journal_size(self) -> int:
+        try:
+            return os.path.getsize(self._journal_path)
+        except FileNotFoundError:
+            return 0
+
+    def _flock(self, mode):
+        os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(self._lock_path, "a")
+        fcntl.flock(lock_file, mode)
+        return lock_file
+
+    def _refresh_locked(self):
+        signature = self._disk_signature()
+        if signature != self._signature:
+            # New snapshot: start over from it and replay the whole journal
+            self._load_snapshot()
+            self._signature = signature
+
+        if not os.path.exists(self._journal_path):
+            return
+        with open(self._journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            data = f.read()
+        # Only consume complete lines
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").splitlines():
+            self._apply(json.loads(line))
+            self._journal_entries += 1
+        self._journal_offset += end
+
+    def refresh(self):
+        """Catch up with changes other processes made since this one last read or wrote"""
+        with self._lock:
+            if self._disk_signature() == self._signature and self._journal_size() == self._journal_offset:
+                return
+            lock_file = self._flock(fcntl.LOCK_SH)
+            try:
+                self._refresh_locked()
+            finally:
+                lock_file.close()
+
+    def _write(self, mutate):
+        """Run mutate() on the latest state under the cross-process lock and journal its record"""
+        with self._lock:
+            lock_file = self._flock(fcntl.LOCK_EX)
+            try:
+                self._refresh_locked()
+                record = mutate()
+                if record is None:
+                    return False
+
+                line = (json.dumps(record) + "\n").encode("utf-8")
+                with open(self._journal_path, "ab") as f:
+                    # Drop a torn line left by a writer that died mid-append
+                    f.truncate(self._journal_offset)
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_offset += len(line)
+                self._journal_entries += 1
+
+                if self._journal_entries >= CANDIDATE_JOURNAL_MAX:
+                    self._save_locked()
+                return True
+            finally:
+                lock_file.close()
+
+    # ========== CHANGES ==========
+    def _add(self, candidate_id: str, skills: list, experience: float, vector, extra: dict, faiss_id: int = None):
+        self._ensure_index(vector.shape[0])
+        if candidate_id in self.candidates:
+            self._remove(candidate_id)
+
+        if faiss_id is None:
+            faiss_id = self._next_id
+        self._next_id = max(self._next_id, faiss_id + 1)
+        self.index.add_with_ids(vector.reshape(1, -1), np.array([faiss_id], dtype=np.int64))
+        self.candidates[candidate_id] = {
+            "faiss_id": faiss_id,
+            "skills": skills,
+            "experience": experience,
+            **extra
+        }
+        self._faiss_ids[faiss_id] = candidate_id
+        self.version += 1
+        return {
+            "op": "add",
+            "candidate_id": candidate_id,
+            "faiss_id": faiss_id,
+            "skills": skills,
+            "experience": experience,
+            "extra": extra,
+            "vector": base64.b64encode(vector.astype(np.float32).tobytes()).decode("ascii")
+        }
+
+    def _remove(self, candidate_id: str):
+        entry = self.candidates.pop(candidate_id, None)
+        if entry is None:
+            return None
+        self.index.remove_ids(np.array([entry["faiss_id"]], dtype=np.int64))
+        del self._faiss_ids[entry["faiss_id"]]
+        self.version += 1
+        return {"op": "remove", "candidate_id": candidate_id}
+
+    def _apply(self, record: dict):
+        """Replay one journal record (idempotent: snapshots may already contain it)"""
+        if record["op"] == "add":
+            vector = np.frombuffer(base64.b64decode(record["vector"]), dtype=np.float32).copy()
+            self._add(record["candidate_id"], record["skills"], record["experience"],
+                      vector, record["extra"], faiss_id=record["faiss_id"])
+        elif record["op"] == "remove":
+            self._remove(record["candidate_id"])
+
+    def add(self, candidate_id: str, skills: list, experience: float = 0.0, **extra):
+        """Add a candidate, replacing any existing entry with the same id"""
+        skills = list(skills)
+        if not skills:
+            raise ValueError(f"Candidate {candidate_id!r} has no skills to index")
+        vector = _profile_vector(skills)
+        self._write(lambda: self._add(candidate_id, skills, experience, vector, extra))
+
+    # Re-adding replaces the vector and metadata
+    update = add
+
+    def remove(self, candidate_id: str) -> bool:
+        return self._write(lambda: self._remove(candidate_id))
+
+    # ========== QUERIES ==========
+    def entries(self) -> list:
+        """[(candidate_id, entry)] snapshot of the current pool"""
+        with self._lock:
+            self.refresh()
+            return list(self.candidates.items())
+
+    def search(self, jd_skills: list, k: int = 50, jd_embeddings=None):
+        """Returns [(candidate_id, similarity)] for the k nearest candidate profiles"""
+        with self._lock:
+            self.refresh()
+            if self.index is None or self.index.ntotal == 0 or not jd_skills or k < 1:
+                return []
+            query = _profile_vector(jd_skills, jd_embeddings).reshape(1, -1)
+            scores, ids = self.index.search(query, min(k, self.index.ntotal))
+
+            return [
+                (self._faiss_ids[int(faiss_id)], float(score))
+                for faiss_id, score in zip(ids[0], scores[0])
+                if faiss_id != -1
+            ]
+
+    def shortlist(self, jd_skills: list, required_exp=2, k: int = 50,
+                  threshold=0.5, jd_embeddings=None):
+        """FAISS top-k, then full semantic_match + calculate_scores on the shortlist only"""
+        results = []
+        for candidate_id, similarity in self.search(jd_skills, k, jd_embeddings):
+            entry = self.candidates.get(candidate_id)
+            if entry is None:
+                continue  # removed by another worker since the search
+            match_rate, matched, missing = semantic_match(
+                entry["skills"], jd_skills, threshold=threshold, jd_embeddings=jd_embeddings
+            )
+            results.append({
+                "candidate_id": candidate_id,
+                "retrieval_similarity": round(similarity, 4),
+                "scores": calculate_scores(match_rate, entry["experience"], required_exp),
+                "match_details": {
+                    "matched_skills": matched,
+                    "missing_skills": missing
+                }
+            })
+
+        results.sort(key=lambda r: r["scores"]["overall_score"], reverse=True)
+        return results
+
+    def _save_locked(self):
+        """Fold the journal into a new snapshot: temp files renamed into place, then an empty journal"""
+        os.makedirs(self.directory, exist_ok=True)
+        if self.index is not None:
+            tmp_index = self._index_path + ".tmp"
+            faiss.write_index(self.index, tmp_index)
+
+            tmp_meta = self._meta_path + ".tmp"
+            with open(tmp_meta, "w") as f:
+                json.dump({
+                    "dim": self.dim,
+                    "next_id": self._next_id,
+                    "candidates": self.candidates
+                }, f)
+
+            # Metadata last: its signature is what other processes watch
+            os.replace(tmp_index, self._index_path)
+            os.replace(tmp_meta, self._meta_path)
+            self._signature = self._disk_signature()
+
+        # A crash before this point only leaves journal entries the snapshot already holds
+        open(self._journal_path, "wb").close()
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+    def save(self):
+        """Compact now (otherwise done every CANDIDATE_JOURNAL_MAX changes)"""
+        with self._lock:
+            lock_file = self._flock(fcntl.LOCK_EX)
+            try:
+                self._refresh_locked()
+                self._save_locked()
+            finally:
+                lock_file.close()
+
+    def _load_snapshot(self):
+        """Reset to the snapshot on disk (or to empty without one); callers hold the file lock"""
+        self.index = None
+        self.candidates = {}
+        self._faiss_ids = {}
+        self._next_id = 0
+        self._journal_offset = 0
+        self._journal_entries = 0
+        if os.path.exists(self._meta_path) and os.path.exists(self._index_path):
+            self.index = faiss.read_index(self._index_path)
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self._next_id = meta["next_id"]
+            self.candidates = meta["candidates"]
+            self._faiss_ids = {
+                entry["faiss_id"]: candidate_id for candidate_id, entry in self.candidates.items()
+            }
+        self.version += 1
@@ -0,0 +1,267 @@
+"""
+Offline bulk matcher: a directory of resumes against one or more JD files.
+
+    python -m app.cli RESUME_DIR --jd backend.txt --jd data.pdf --output results.jsonl
+    python -m app.cli RESUME_DIR --jd backend.txt --output results.jsonl --resume   # after a crash
+    python -m app.cli RESUME_DIR --jd backend.txt --output results.jsonl --parquet results.parquet
+
+Each worker process loads GLiNER + MiniLM and extracts the JD profiles once,
+then takes --batch-size resumes at a time through
+resume_parser -> ner_model -> skill_matcher -> scoring. There is one JSONL row per
+(resume, JD). Parsed resumes go to the profile store, so rerunning against a new
+JD skips NER.
+
+Progress is checkpointed after every batch: <output>.checkpoint records the
+finished files and the output size at that point. --resume truncates any
+half-written tail of the output and skips the finished files.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+RESUME_SUFFIXES = (".pdf", ".docx")
+
+# Per-worker state, set by _init_worker
+_jobs = None
+_options = None
+
+
+def find_resumes(resume_dir: str) -> list:
+    """Relative paths of every PDF/DOCX under resume_dir, in a stable order"""
+    paths = []
+    for root, _, names in os.walk(resume_dir):
+        for name in names:
+            if name.lower().endswith(RESUME_SUFFIXES) and not name.startswith("."):
+                paths.append(os.path.relpath(os.path.join(root, name), resume_dir))
+    return sorted(paths)
+
+
+def read_jd(path: str) -> str:
+    if path.lower().endswith(RESUME_SUFFIXES):
+        from app.resume_parser import extract_text
+        with open(path, "rb") as f:
+            return extract_text(f.read(), path)
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+# ========== CHECKPOINT ==========
+def load_checkpoint(checkpoint_path: str, output_path: str) -> set:
+    """Finished files; truncates output to the last checkpointed size so no row is written twice"""
+    done = set()
+    offset = 0
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # killed mid-write; everything after it was never committed
+                done.update(entry["files"])
+                offset = entry["offset"]
+        # Rewrite as one clean entry so new entries never follow a torn line; the
+        # temp file + rename means a crash here leaves either the old or the new file
+        tmp_path = checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            _append_durably(f, json.dumps({"files": sorted(done), "offset": offset}) + "\n")
+        os.replace(tmp_path, checkpoint_path)
+    if os.path.exists(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(offset)
+    return done
+
+
+def _append_durably(f, text: str):
+    f.write(text)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+# ========== WORKER ==========
+def _init_worker(jds: list, options: dict):
+    """Runs once per process: load the models and the JD profiles"""
+    global _jobs, _options
+    import torch
+    from app.jd_cache import get_jd_profiles
+    from app.ner_model import get_model
+    from app.skill_matcher import get_embedder
+
+    torch.set_num_threads(options["torch_threads"])
+    get_model()
+    get_embedder()
+    profiles = get_jd_profiles([jd_text for _, jd_text in jds])
+    _jobs = [(jd_id, jd_skills, jd_embeddings) for (jd_id, _), (jd_skills, jd_embeddings) in zip(jds, profiles)]
+    _options = options
+
+
+def _profiles_for_batch(paths: list):
+    from app.ner_model import extract_entities_batch
+    from app.profile_store import ProfileStore, profile_id_for
+    from app.resume_parser import extract_text
+    from app.scoring import extract_years_of_experience
+
+    store = ProfileStore() if _options["profile_store"] else None
+    profiles, errors = {}, {}
+    pending = []
+    for path in paths:
+        try:
+            with open(os.path.join(_options["resume_dir"], path), "rb") as f:
+                data = f.read()
+            profile_id = profile_id_for(data)
+            profile = store.get(profile_id) if store else None
+            if profile is None:
+                pending.append((path, profile_id, extract_text(data, path)))
+            else:
+                profiles[path] = profile
+        except Exception as e:
+            errors[path] = f"{type(e).__name__}: {e}"
+
+    # One batched GLiNER pass for everything not already in the profile store
+    if pending:
+        resumes_data = extract_entities_batch([text for _, _, text in pending], segment=True)
+        for (path, profile_id, text), resume_data in zip(pending, resumes_data):
+            experience_years = extract_years_of_experience(text)
+            if store:
+                store.put(profile_id, os.path.basename(path), text, resume_data, experience_years)
+            profiles[path] = {
+                "profile_id": profile_id,
+                "entities": resume_data,
+                "experience_years": experience_years
+            }
+    return profiles, errors
+
+
+def process_batch(paths: list) -> tuple:
+    """Returns (paths, JSONL rows, error count) for one batch of resumes"""
+    from app.scoring import calculate_scores
+    from app.skill_matcher import semantic_match_multi
+
+    profiles, errors = _profiles_for_batch(paths)
+    rows = []
+    for path in paths:
+        if path in errors:
+            rows.append({"file": path, "error": errors[path]})
+            continue
+        profile = profiles[path]
+        skills = profile["entities"]["skills"]
+        match_results = semantic_match_multi(
+            skills, [jd_skills for _, jd_skills, _ in _jobs], threshold=_options["threshold"],
+            jd_embeddings_list=[jd_embeddings for _, _, jd_embeddings in _jobs]
+        )
+        for (jd_id, _, _), (match_rate, matched, missing) in zip(_jobs, match_results):
+            rows.append({
+                "file": path,
+                "jd": jd_id,
+                "profile_id": profile["profile_id"],
+                "extracted_skills": skills,
+                "extracted_experience": profile["experience_years"],
+                "scores": calculate_scores(match_rate, profile["experience_years"], _options["required_exp"]),
+                "matched_skills": matched,
+                "missing_skills": missing
+            })
+    return paths, rows, len(errors)
+
+
+# ========== DRIVER ==========
+def write_parquet(jsonl_path: str, parquet_path: str):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("--parquet needs pyarrow: pip install pyarrow")
+
+    with open(jsonl_path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    # Flatten scores so the columns are directly queryable
+    for row in rows:
+        for key, value in (row.pop("scores", None) or {}).items():
+            row[key] = value
+    pq.write_table(pa.Table.from_pylist(rows), parquet_path)
+
+
+def _log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def run(args) -> dict:
+    paths = find_resumes(args.resume_dir)
+    checkpoint_path = args.output + ".checkpoint"
+    if args.resume:
+        done = load_checkpoint(checkpoint_path, args.output)
+    else:
+        done = set()
+        for path in (args.output, checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+    todo = [path for path in paths if path not in done]
+    _log(f"{len(paths)} resumes found, {len(done)} already done, {len(todo)} to process")
+
+    jds = [(os.path.basename(path), read_jd(path)) for path in args.jd]
+    options = {
+        "resume_dir": args.resume_dir,
+        "threshold": args.threshold,
+        "required_exp": args.required_exp,
+        "profile_store": not args.no_profile_store,
+        "torch_threads": max(1, (os.cpu_count() or 1) // args.workers)
+    }
+    batches = [todo[i:i + args.batch_size] for i in range(0, len(todo), args.batch_size)]
+
+    start = time.perf_counter()
+    processed = failed = 0
+    # spawn: never fork a process that already has torch threads running
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers, initializer=_init_worker, initargs=(jds, options)) as pool, \
+            open(args.output, "a", encoding="utf-8") as output, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        for batch_paths, rows, errors in pool.imap_unordered(process_batch, batches):
+            # Rows first, then the checkpoint that commits them
+            _append_durably(output, "".join(json.dumps(row) + "\n" for row in rows))
+            _append_durably(checkpoint, json.dumps({"files": batch_paths, "offset": output.tell()}) + "\n")
+
+            processed += len(batch_paths)
+            failed += errors
+            elapsed = time.perf_counter() - start
+            rate = processed / elapsed if elapsed else 0.0
+            eta = (len(todo) - processed) / rate if rate else 0.0
+            _log(f"{processed}/{len(todo)} resumes  {rate:.2f} resumes/s  {failed} failed  ETA {eta:.0f}s")
+
+    if args.parquet:
+        write_parquet(args.output, args.parquet)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "resumes": len(paths),
+        "skipped_from_checkpoint": len(done),
+        "processed": processed,
+        "failed": failed,
+        "jds": [jd_id for jd_id, _ in jds],
+        "elapsed_s": round(elapsed, 3),
+        "resumes_per_s": round(processed / elapsed, 3) if elapsed else None,
+        "output": args.output,
+        "parquet": args.parquet
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Bulk-match a directory of resumes")
+    parser.add_argument("resume_dir")
+    parser.add_argument("--jd", action="append", required=True, help="JD file (.txt/.pdf/.docx); repeatable")
+    parser.add_argument("--output", default="results.jsonl")
+    parser.add_argument("--parquet", help="also write the results as Parquet (needs pyarrow)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--batch-size", type=int, default=16, help="resumes per GLiNER batch / checkpoint")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--required-exp", type=float, default=2)
+    parser.add_argument("--resume", action="store_true", help="continue from <output>.checkpoint")
+    parser.add_argument("--no-profile-store", action="store_true", help="do not read or write the profile store")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
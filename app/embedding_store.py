@@ -0,0 +1,119 @@
+import fcntl
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+EMBEDDING_STORE_DIR = os.getenv(
+    "EMBEDDING_STORE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_matcher", "skill_embeddings")
+)
+
+
+def normalize_skill(skill: str) -> str:
+    # MiniLM is uncased, so lowercasing does not change the embedding
+    return re.sub(r'\s+', ' ', str(skill)).strip().lower()
+
+
+class SkillEmbeddingStore:
+    """
+    Append-only skill -> vector store shared by every worker process.
+
+    Layout (one directory per embedding model):
+        index.txt    one normalised skill per line, line i <-> row i
+        vectors.f16  float16 rows of `dim` values, memory-mapped read-only
+        meta.json    model name and dimension
+
+    Vectors are written before their index lines, so a reader never sees
+    a skill without its row. Writers serialise on an flock'd lock file.
+    """
+
+    def __init__(self, directory: str, model_name: str, dim: int):
+        self.directory = os.path.join(directory, model_name.replace("/", "__"))
+        self.dim = dim
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._index_path = os.path.join(self.directory, "index.txt")
+        self._vectors_path = os.path.join(self.directory, "vectors.f16")
+        self._lock_path = os.path.join(self.directory, ".lock")
+
+        self._rows = {}
+        self._index_offset = 0
+        self._vectors = None
+        self._thread_lock = threading.Lock()
+
+        meta_path = os.path.join(self.directory, "meta.json")
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w") as f:
+                json.dump({"model": model_name, "dim": dim, "dtype": "float16"}, f)
+
+        for path in (self._index_path, self._vectors_path):
+            open(path, "ab").close()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _refresh(self):
+        """Pick up rows appended by this or other processes since the last read"""
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+
+        # Only consume complete lines
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return
+        for line in data[:end].decode("utf-8").split("\n")[:-1]:
+            self._rows.setdefault(line, len(self._rows))
+        self._index_offset += end
+
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float16, mode="r", shape=(len(self._rows), self.dim)
+        )
+
+    def lookup(self, skills: list):
+        """Returns ({skill: float32 vector}, [skills not in the store])"""
+        with self._thread_lock:
+            self._refresh()
+            found = {}
+            missing = []
+            for skill in skills:
+                row = self._rows.get(skill)
+                if row is None:
+                    missing.append(skill)
+                else:
+                    found[skill] = np.asarray(self._vectors[row], dtype=np.float32)
+            return found, missing
+
+    def add(self, skills: list, vectors):
+        """Append new skills and their vectors; skills already stored are skipped"""
+        vectors = np.asarray(vectors, dtype=np.float16).reshape(len(skills), self.dim)
+
+        with self._thread_lock, open(self._lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                new_rows = {}
+                for skill, vector in zip(skills, vectors):
+                    if skill and "\n" not in skill and skill not in self._rows and skill not in new_rows:
+                        new_rows[skill] = vector
+                if not new_rows:
+                    return
+
+                # Truncate any rows left behind by a writer that died before updating the index
+                row_bytes = self.dim * np.dtype(np.float16).itemsize
+                with open(self._vectors_path, "r+b") as f:
+                    f.truncate(len(self._rows) * row_bytes)
+                    f.seek(0, os.SEEK_END)
+                    f.write(np.stack(list(new_rows.values())).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                with open(self._index_path, "ab") as f:
+                    f.write("".join(skill + "\n" for skill in new_rows).encode("utf-8"))
+
+                self._refresh()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,106 @@
+"""
+Single-pass years-of-experience scanner shared by ner_model and scoring.
+
+One precompiled pattern (no unbounded .*? gaps, so matching stays linear in
+the text length) finds both explicit "N+ years" mentions and date ranges
+("Sep 2018 - Present", "2015 – 2018", "06/2015 to 08/2018"). Date ranges are
+merged as intervals so overlapping jobs are not double counted, and open
+ranges are measured against today's date rather than a hardcoded year.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+_MONTH = r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+_YEAR = r'(?:19|20)\d{2}'
+
+EXPERIENCE_PATTERN = re.compile(
+    # Date range: [Month|MM/] YYYY  -  Present | [Month|MM/] YYYY
+    rf'(?:(?P<start_month>{_MONTH})\s*|(?P<start_mm>\d{{1,2}})\s*/\s*)?(?<!\d)(?P<start_year>{_YEAR})\b'
+    rf'\s*(?:-|–|—|to|until)\s*'
+    rf'(?:(?P<present>present|current|now|today|date)\b'
+    rf'|(?:(?P<end_month>{_MONTH})\s*|(?P<end_mm>\d{{1,2}})\s*/\s*)?(?<!\d)(?P<end_year>{_YEAR})\b)'
+    # Explicit mention: "6+ years", "3 yrs"
+    r'|\b(?P<years>\d{1,2})\s*\+?\s*(?:years?|yrs?)\b',
+    re.IGNORECASE
+)
+
+
+def _month_number(name, number):
+    if name:
+        return _MONTHS[name[:3].lower()]
+    if number and 1 <= int(number) <= 12:
+        return int(number)
+    return None
+
+
+def merge_intervals(intervals: list) -> list:
+    """Merge overlapping/adjacent (start, end) month intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def scan_experience(text: str, today: date = None) -> dict:
+    """
+    Returns explicit_years (largest "N years" mention), tenure_years (merged
+    date ranges) and the merged intervals as absolute month indices.
+    """
+    result = _scan(text, today or date.today())
+    return {**result, "intervals": list(result["intervals"])}
+
+
+@lru_cache(maxsize=128)
+def _scan(text: str, today: date) -> dict:
+    now = today.year * 12 + today.month  # exclusive end of the current month
+    explicit_years = 0
+    intervals = []
+
+    for match in EXPERIENCE_PATTERN.finditer(text):
+        if match.group("years"):
+            explicit_years = max(explicit_years, int(match.group("years")))
+            continue
+
+        start_month = _month_number(match.group("start_month"), match.group("start_mm")) or 1
+        start = int(match.group("start_year")) * 12 + start_month - 1
+
+        if match.group("present"):
+            end = now
+        else:
+            end_month = _month_number(match.group("end_month"), match.group("end_mm"))
+            # "Jun 2015 - Aug 2018" includes August; bare "2015 - 2018" is three years
+            end = int(match.group("end_year")) * 12 + (end_month if end_month else 0)
+
+        end = min(end, now)
+        if start < end:
+            intervals.append((start, end))
+
+    merged = merge_intervals(intervals)
+    tenure_months = sum(end - start for start, end in merged)
+
+    return {
+        "explicit_years": explicit_years,
+        "tenure_years": round(tenure_months / 12, 1),
+        "intervals": merged
+    }
+
+
+def total_years_of_experience(text: str, today: date = None, tenure_text: str = None) -> float:
+    """
+    Best estimate of total experience: the larger of stated years and dated tenure.
+    tenure_text (e.g. the Experience section) limits which date ranges count as
+    employment, so education or certification dates are not added as tenure.
+    """
+    scan = scan_experience(text, today)
+    tenure_years = scan["tenure_years"]
+    if tenure_text is not None:
+        tenure_years = scan_experience(tenure_text, today)["tenure_years"]
+    return float(max(scan["explicit_years"], tenure_years))
@@ -0,0 +1,148 @@
+"""
+Skill gazetteer: exact dictionary matching of a skills taxonomy.
+
+The taxonomy is compiled once into an Aho-Corasick automaton, so the whole
+document is matched in a single linear pass regardless of how many skills
+and aliases the taxonomy holds.
+
+Taxonomy file format (one skill per line, '#' for comments):
+    canonical name|alias 1|alias 2
+
+A surface form written as ~word only matches when the document capitalises
+it ("Excel", not "I excel at"): for skill names that are also ordinary words.
+"""
+import os
+import re
+import threading
+from collections import deque
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skills_taxonomy.txt")
+SKILLS_TAXONOMY = os.getenv("SKILLS_TAXONOMY", DEFAULT_TAXONOMY_PATH)
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def _taxonomy_lines(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield [_normalize(name) for name in line.split("|")]
+
+
+def load_taxonomy(path: str) -> dict:
+    """Returns {surface form: canonical name}, canonical names included"""
+    surface_forms = {}
+    for names in _taxonomy_lines(path):
+        names = [name.lstrip("~") for name in names]
+        canonical = names[0]
+        for name in names:
+            if name:
+                surface_forms.setdefault(name, canonical)
+    return surface_forms
+
+
+def load_capitalised_forms(path: str) -> set:
+    """Surface forms marked ~ in the taxonomy: matched only when capitalised in the text"""
+    return {name[1:] for names in _taxonomy_lines(path) for name in names if name.startswith("~")}
+
+
+class SkillGazetteer:
+    """Aho-Corasick automaton over skill surface forms with word-boundary checks"""
+
+    def __init__(self, surface_forms: dict, capitalised: set = frozenset()):
+        self.surface_forms = surface_forms
+        self.capitalised = set(capitalised)
+        # Trie as parallel arrays: goto transitions, failure links, outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]  # surface forms ending at each state
+
+        for pattern in surface_forms:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern)
+
+        # Breadth-first failure links; outputs inherit from their failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @classmethod
+    def from_file(cls, path: str):
+        return cls(load_taxonomy(path), load_capitalised_forms(path))
+
+    def __len__(self):
+        return len(self.surface_forms)
+
+    def find(self, text: str):
+        """
+        Leftmost-longest, non-overlapping matches on whole words.
+        Returns [(start, end, surface form, canonical name)] in normalised-text offsets.
+        """
+        original = re.sub(r'\s+', ' ', text).strip()
+        text = original.lower()
+        if len(text) != len(original):
+            original = None  # lowercasing changed offsets; skip the capitalisation check
+        goto, fail, output = self._goto, self._fail, self._output
+
+        candidates = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in output[state]:
+                start = i - len(pattern) + 1
+                end = i + 1
+                # Word boundaries: no letter/digit glued on either side
+                if start > 0 and text[start - 1].isalnum() and pattern[0].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum() and pattern[-1].isalnum():
+                    continue
+                if pattern in self.capitalised and original is not None and not original[start].isupper():
+                    continue
+                candidates.append((start, end, pattern))
+
+        matches = []
+        last_end = -1
+        for start, end, pattern in sorted(candidates, key=lambda m: (m[0], m[0] - m[1])):
+            if start >= last_end:
+                matches.append((start, end, pattern, self.surface_forms[pattern]))
+                last_end = end
+        return matches
+
+    def extract(self, text: str) -> set:
+        """Canonical skill names mentioned in the text"""
+        return {canonical for _, _, _, canonical in self.find(text)}
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> SkillGazetteer:
+    """Compile the configured taxonomy once per process"""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = SkillGazetteer.from_file(SKILLS_TAXONOMY)
+    return _gazetteer
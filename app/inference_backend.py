@@ -0,0 +1,283 @@
+"""
+Selectable CPU inference backends for GLiNER and the MiniLM embedder.
+
+INFERENCE_BACKEND (read at startup):
+    torch  - fp32 PyTorch, the reference
+    int8   - torch dynamic int8 quantization of every nn.Linear
+    onnx   - ONNX Runtime; GLiNER needs model.onnx in its bundle directory
+             (see `export`), MiniLM uses sentence-transformers' ONNX backend.
+             Needs `pip install onnx onnxruntime optimum[onnxruntime]`
+    stub   - deterministic stand-ins, no weights loaded: taxonomy lookup for
+             "skill" entities and hashed character-trigram embeddings. For load
+             tests of the web/parsing layers (benchmarks/load.py), not for scoring.
+
+Export ONNX files into the model bundle and check that a backend agrees with fp32:
+    python -m app.inference_backend export --model-dir /models
+    python -m app.inference_backend verify --backend int8 [--samples DIR]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import zlib
+
+import numpy as np
+
+import torch
+
+BACKENDS = ("torch", "int8", "onnx", "stub")
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch").lower()
+GLINER_ONNX_FILE = "model.onnx"
+
+if INFERENCE_BACKEND not in BACKENDS:
+    raise ValueError(f"INFERENCE_BACKEND must be one of {BACKENDS}, got {INFERENCE_BACKEND!r}")
+
+
+def _quantize(module):
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+# ========== STUB MODELS ==========
+class StubGLiNER:
+    """Finds taxonomy skills (gazetteer) and labels them "skill"; every other label stays empty"""
+
+    def predict_entities(self, text: str, labels: list, threshold: float = 0.5, **kwargs) -> list:
+        if "skill" not in labels:
+            return []
+        from app.gazetteer import get_gazetteer
+
+        # Lowercased, whitespace-collapsed copy of the text plus each character's original offset
+        chars, offsets = [], []
+        for token in re.finditer(r'\S+', text):
+            if chars:
+                chars.append(" ")
+                offsets.append(token.start())
+            for i, char in enumerate(token.group()):
+                lowered = char.lower()
+                chars.append(lowered if len(lowered) == 1 else "_")
+                offsets.append(token.start() + i)
+
+        entities = []
+        for start, end, _, _ in get_gazetteer().find("".join(chars)):
+            start, end = offsets[start], offsets[end - 1] + 1
+            entities.append({"start": start, "end": end, "text": text[start:end], "label": "skill", "score": 1.0})
+        return entities
+
+    def batch_predict_entities(self, texts: list, labels: list, threshold: float = 0.5, **kwargs) -> list:
+        return [self.predict_entities(text, labels, threshold) for text in texts]
+
+
+class StubEmbedder:
+    """Hashed character trigrams, L2-normalised: same string -> same vector in every process"""
+
+    dimension = 384
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _vector(self, sentence: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        padded = f"  {sentence.lower()} "
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i:i + 3].encode("utf-8")) % self.dimension] += 1.0
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    def encode(self, sentences, convert_to_tensor: bool = False, **kwargs):
+        single = isinstance(sentences, str)
+        sentences = [sentences] if single else list(sentences)
+        vectors = np.zeros((len(sentences), self.dimension), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            vectors[i] = self._vector(sentence)
+        if single:
+            vectors = vectors[0]
+        return torch.from_numpy(vectors) if convert_to_tensor else vectors
+
+
+def load_gliner(path: str, is_local: bool, backend: str = INFERENCE_BACKEND):
+    if backend == "stub":
+        return StubGLiNER()
+    from gliner import GLiNER
+
+    if backend == "onnx":
+        if not os.path.exists(os.path.join(path, GLINER_ONNX_FILE)):
+            raise FileNotFoundError(
+                f"{path}/{GLINER_ONNX_FILE} not found; run `python -m app.inference_backend export` first"
+            )
+        return GLiNER.from_pretrained(
+            path, local_files_only=True, load_onnx_model=True,
+            load_tokenizer=True, onnx_model_file=GLINER_ONNX_FILE
+        )
+
+    model = GLiNER.from_pretrained(path, local_files_only=is_local)
+    model.eval()
+    if backend == "int8":
+        _quantize(model)
+    return model
+
+
+def load_embedder(path: str, is_local: bool, backend: str = INFERENCE_BACKEND):
+    if backend == "stub":
+        return StubEmbedder()
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx":
+        # Exports on first load if the directory has no onnx/model.onnx yet
+        return SentenceTransformer(path, local_files_only=is_local, backend="onnx")
+
+    model = SentenceTransformer(path, local_files_only=is_local)
+    model.eval()
+    if backend == "int8":
+        _quantize(model)
+    return model
+
+
+# ========== EXPORT ==========
+def export_gliner_onnx(gliner_dir: str):
+    """Trace the GLiNER encoder/span head to ONNX next to its weights"""
+    from gliner import GLiNER
+
+    model = GLiNER.from_pretrained(gliner_dir, local_files_only=True)
+    model.eval()
+    inputs, _ = model.prepare_model_inputs(["ONNX export sample text for Python and SQL"], ["skill", "tool"])
+
+    names = ["input_ids", "attention_mask", "words_mask", "text_lengths"]
+    dynamic_axes = {
+        "input_ids": {0: "batch_size", 1: "sequence_length"},
+        "attention_mask": {0: "batch_size", 1: "sequence_length"},
+        "words_mask": {0: "batch_size", 1: "sequence_length"},
+        "text_lengths": {0: "batch_size", 1: "value"},
+        "logits": {0: "position", 1: "batch_size", 2: "sequence_length", 3: "num_classes"}
+    }
+    if model.config.span_mode != "token_level":
+        names += ["span_idx", "span_mask"]
+        dynamic_axes["span_idx"] = {0: "batch_size", 1: "num_spans", 2: "idx"}
+        dynamic_axes["span_mask"] = {0: "batch_size", 1: "num_spans"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model.model,
+            tuple(inputs[name] for name in names),
+            os.path.join(gliner_dir, GLINER_ONNX_FILE),
+            input_names=names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+
+
+def export_embedder_onnx(embedder_dir: str):
+    # sentence-transformers exports to <dir>/onnx/model.onnx on load; save it into the bundle
+    load_embedder(embedder_dir, True, backend="onnx").save_pretrained(embedder_dir)
+
+
+# ========== VERIFICATION ==========
+SAMPLE_TEXTS = [
+    "Senior Python developer with 6+ years experience building FastAPI microservices on AWS, "
+    "Docker and Kubernetes. Strong SQL, PostgreSQL and Redis skills; led a team of five engineers.",
+    "Administrative Assistant, Redford & Sons, September 2018 - Present. Microsoft Excel, scheduling, "
+    "travel arrangements, meeting minutes, confidentiality and time management.",
+    "Registered Nurse (RN) in the ICU since 2015. BLS and ACLS certified, Epic EHR charting, "
+    "medication administration, wound care and patient education.",
+    "Data scientist: machine learning, PyTorch, scikit-learn, pandas, A/B testing and Tableau dashboards. "
+    "M.Sc. Statistics, Stanford University."
+]
+
+
+def _load_samples(samples_dir: str = None) -> list:
+    if not samples_dir:
+        return list(SAMPLE_TEXTS)
+
+    from app.resume_parser import extract_text
+
+    texts = []
+    for name in sorted(os.listdir(samples_dir)):
+        path = os.path.join(samples_dir, name)
+        if name.endswith(".txt"):
+            with open(path, encoding="utf-8") as f:
+                texts.append(f.read())
+        elif name.endswith((".pdf", ".docx")):
+            with open(path, "rb") as f:
+                texts.append(extract_text(f.read(), name))
+    return texts
+
+
+def _entity_keys(entities: list) -> set:
+    return {(e["text"].lower(), e["label"]) for e in entities}
+
+
+def verify(backend: str, samples_dir: str = None, threshold: float = 0.5) -> dict:
+    """Compare a backend against fp32 torch on the sample set"""
+    from sentence_transformers import util
+    from app.model_bundle import EMBEDDING_MODEL_NAME, GLINER_MODEL_NAME, resolve_model
+    from app.ner_model import labels
+
+    texts = _load_samples(samples_dir)
+    gliner_path, gliner_local = resolve_model(GLINER_MODEL_NAME)
+    embedder_path, embedder_local = resolve_model(EMBEDDING_MODEL_NAME)
+
+    # NER: F1 of (text, label) pairs vs the fp32 baseline
+    baseline = load_gliner(gliner_path, gliner_local, backend="torch")
+    candidate = load_gliner(gliner_path, gliner_local, backend=backend)
+    base_entities = [_entity_keys(e) for e in baseline.batch_predict_entities(texts, labels, threshold=0.3)]
+    cand_entities = [_entity_keys(e) for e in candidate.batch_predict_entities(texts, labels, threshold=0.3)]
+    del baseline, candidate
+
+    overlap = sum(len(b & c) for b, c in zip(base_entities, cand_entities))
+    total = sum(len(b) + len(c) for b, c in zip(base_entities, cand_entities))
+    entity_agreement = 2 * overlap / total if total else 1.0
+
+    # Embeddings: cosine between backends, and whether thresholded matches flip
+    skills = sorted({text for entities in base_entities for text, _ in entities}) or ["python", "sql"]
+    baseline = load_embedder(embedder_path, embedder_local, backend="torch")
+    candidate = load_embedder(embedder_path, embedder_local, backend=backend)
+    base_vectors = baseline.encode(skills, convert_to_tensor=True)
+    cand_vectors = candidate.encode(skills, convert_to_tensor=True)
+
+    pairwise = torch.nn.functional.cosine_similarity(base_vectors, cand_vectors)
+    base_matrix = util.cos_sim(base_vectors, base_vectors) >= threshold
+    cand_matrix = util.cos_sim(cand_vectors, cand_vectors) >= threshold
+
+    return {
+        "backend": backend,
+        "samples": len(texts),
+        "entity_f1_vs_fp32": round(entity_agreement, 4),
+        "embedding_cosine_mean": round(pairwise.mean().item(), 5),
+        "embedding_cosine_min": round(pairwise.min().item(), 5),
+        "match_decision_agreement": round((base_matrix == cand_matrix).float().mean().item(), 5)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.inference_backend")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="write ONNX files into the model bundle")
+    export.add_argument("--model-dir", default=os.getenv("MODEL_DIR", "models"))
+
+    check = sub.add_parser("verify", help="report agreement of a backend with fp32 torch")
+    check.add_argument("--backend", choices=BACKENDS, default=INFERENCE_BACKEND)
+    check.add_argument("--samples", help="directory of .txt/.pdf/.docx sample documents")
+    check.add_argument("--min-entity-f1", type=float, default=0.95)
+    check.add_argument("--min-decision-agreement", type=float, default=0.99)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from app.model_bundle import EMBEDDING_MODEL_NAME, GLINER_MODEL_NAME, bundle_path
+        export_gliner_onnx(bundle_path(GLINER_MODEL_NAME, args.model_dir))
+        export_embedder_onnx(bundle_path(EMBEDDING_MODEL_NAME, args.model_dir))
+        print(f"ONNX models written to {args.model_dir}")
+        return 0
+
+    report = verify(args.backend, args.samples)
+    print(json.dumps(report, indent=2))
+    passed = (report["entity_f1_vs_fp32"] >= args.min_entity_f1
+              and report["match_decision_agreement"] >= args.min_decision_agreement)
+    if not passed:
+        print("❌ Backend disagrees with the fp32 baseline beyond tolerance", file=sys.stderr)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
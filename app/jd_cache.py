@@ -0,0 +1,130 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from app import metrics
+from app.ner_model import extract_entities, extract_entities_batch
+from app.skill_matcher import encode_skills
+
+JD_CACHE_SIZE = int(os.getenv("JD_CACHE_SIZE", "256"))
+JD_CACHE_TTL = float(os.getenv("JD_CACHE_TTL", "3600"))  # seconds, 0 disables expiry
+
+
+def jd_cache_key(jd_text: str) -> str:
+    """Content hash of the JD with whitespace normalised"""
+    normalized = re.sub(r'\s+', ' ', jd_text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class JDCache:
+    """Size-bounded LRU cache with TTL expiry and hit/miss counters"""
+
+    def __init__(self, max_size=JD_CACHE_SIZE, ttl=JD_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self.ttl or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # Expired
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+jd_cache = JDCache()
+
+
+def get_jd_profile(jd_text: str):
+    """
+    Returns (jd_skills, jd_embeddings) for a job description,
+    running GLiNER + MiniLM only the first time a JD is seen
+    """
+    key = jd_cache_key(jd_text)
+    cached = jd_cache.get(key)
+    if cached is not None:
+        metrics.inc("jd_cache_hit")
+        return cached
+    metrics.inc("jd_cache_miss")
+
+    jd_data = extract_entities(jd_text)
+    jd_skills = list(jd_data["skills"])
+    jd_embeddings = encode_skills(jd_skills) if jd_skills else None
+
+    value = (jd_skills, jd_embeddings)
+    jd_cache.put(key, value)
+    return value
+
+
+def get_jd_profiles(jd_texts: list) -> list:
+    """
+    get_jd_profile for many JDs at once; the uncached ones share
+    one GLiNER batch and one MiniLM encode
+    """
+    keys = [jd_cache_key(jd_text) for jd_text in jd_texts]
+    profiles = {}
+    missing = {}
+    for key, jd_text in zip(keys, jd_texts):
+        if key in profiles or key in missing:
+            continue
+        cached = jd_cache.get(key)
+        if cached is not None:
+            profiles[key] = cached
+        else:
+            missing[key] = jd_text
+    metrics.inc("jd_cache_hit", len(profiles))
+
+    if missing:
+        metrics.inc("jd_cache_miss", len(missing))
+        jd_skills_list = [list(jd_data["skills"]) for jd_data in extract_entities_batch(list(missing.values()))]
+        flat_skills = [skill for jd_skills in jd_skills_list for skill in jd_skills]
+        flat_embeddings = encode_skills(flat_skills) if flat_skills else None
+
+        start = 0
+        for key, jd_skills in zip(missing, jd_skills_list):
+            end = start + len(jd_skills)
+            value = (jd_skills, flat_embeddings[start:end] if jd_skills else None)
+            jd_cache.put(key, value)
+            profiles[key] = value
+            start = end
+
+    return [profiles[key] for key in keys]
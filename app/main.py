@@ -1,50 +1,128 @@
-from fastapi import FastAPI, UploadFile, File, Form
-from app.resume_parser import extract_text_from_pdf
-from app.ner_model import extract_entities
-from app.skill_matcher import semantic_match
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from app.resume_parser import (
+    clean_text, extract_pdf_range, extract_text, iter_archive_documents, pdf_deadline,
+    pdf_page_ranges, sniff_document_type, MAX_DOCUMENT_BYTES, DocumentTooLargeError,
+    UnsupportedDocumentError
+)
+from app.ner_model import extract_entities_batch
+from app.skill_matcher import (
+    encode_skill_lists, semantic_match, semantic_match_batch, semantic_match_multi
+)
 from app.scoring import extract_years_of_experience, calculate_scores
 from app.explainer import generate_explanation
-import shutil
+from app.jd_cache import get_jd_profile, get_jd_profiles, jd_cache
+from app.candidate_index import CandidateIndex
+from app import ranking
+from app.profile_store import ProfileStore, profile_id_for
+from app.model_bundle import readiness, start_background_warmup
+from app.memory import memory_report
+from app.batching import MicroBatcher
+from app.workers import admit, batch_timeout, check_capacity, with_deadline, run_parse, run_inference, pending_requests
+from app import metrics, workers
+from typing import List, Optional
+from functools import partial
+import asyncio
+import heapq
+import json
+import math
+import threading
+import time
 import os
+import uuid
+import zipfile
+
+MAX_JOBS_PER_REQUEST = int(os.getenv("MAX_JOBS_PER_REQUEST", "1000"))
+# Resumes per /match/batch request; larger sets go through /match/stream
+MAX_FILES_PER_REQUEST = int(os.getenv("MAX_FILES_PER_REQUEST", "500"))
+# Documents read/parsed/scored but not yet streamed back; bounds memory for any archive size
+STREAM_MAX_IN_FLIGHT = int(os.getenv("STREAM_MAX_IN_FLIGHT", str(2 * workers.PDF_WORKERS)))
+STREAM_TOP_K = 10
+ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed")
+# PDFs at least this large are split into page ranges parsed in parallel by the PDF pool
+PDF_PARALLEL_MIN_BYTES = int(os.getenv("PDF_PARALLEL_MIN_BYTES", str(256 * 1024)))
+# Candidate feature tables kept for re-weighting, one per (JD, threshold)
+RANK_TABLE_CACHE_SIZE = int(os.getenv("RANK_TABLE_CACHE_SIZE", "8"))
 
 app = FastAPI(title="Intelligent Resume Matcher")
+candidate_index = CandidateIndex()
+profile_store = ProfileStore()
+rank_tables = {}  # (jd_text, threshold) -> (candidate_index.version, CandidateTable)
+rank_tables_lock = threading.Lock()
+ner_batcher = MicroBatcher(partial(extract_entities_batch, segment=True), "ner")
+embedding_batcher = MicroBatcher(encode_skill_lists, "embedding")
 
-@app.post("/match")
-async def match_resume(
-    file: UploadFile = File(...),
-    jd_text: str = Form(...),
-    required_exp: int = Form(2)
-):
-    # 1. Save and Parse Resume
-    file_location = f"temp_{file.filename}"
-    with open(file_location, "wb+") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    resume_text = extract_text_from_pdf(file_location)
-    os.remove(file_location) # Cleanup
-    
-    # 2. Extract Entities (Resume)
-    resume_data = extract_entities(resume_text)
-    candidate_exp = extract_years_of_experience(resume_text)
-    
-    # 3. Extract Entities (JD) - Reusing NER for JD parsing
-    jd_data = extract_entities(jd_text)
-    jd_skills = list(jd_data["skills"])
-    
-    # 4. Semantic Matching
-    match_rate, matched, missing = semantic_match(resume_data["skills"], jd_skills)
+
+@app.on_event("startup")
+def warm_models():
+    # Load GLiNER + MiniLM in the background so the process answers /healthz immediately
+    if os.getenv("WARMUP_ON_STARTUP", "1") != "0":
+        start_background_warmup()
+
+
+@app.on_event("shutdown")
+def stop_workers():
+    workers.shutdown()
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        metrics.observe("http_request_seconds", time.perf_counter() - start, route_path)
+        metrics.count("http_responses_total", route=route_path, status=str(status))
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/healthz")
+def healthz():
+    # Liveness: the process is up and serving
+    return {"status": "ok"}
+
+
+@app.get("/memory")
+def memory():
+    # Under gunicorn the parent is the master that holds the preloaded weights
+    return memory_report(os.getppid() if os.getenv("SERVER_SOFTWARE", "").startswith("gunicorn") else None)
+
+
+@app.get("/ready")
+def ready():
+    # Readiness: both models are loaded and requests will not block on a cold start
+    state = readiness()
+    state["pending_requests"] = pending_requests()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
+def _profile_result(profile: dict, match_result, required_exp: int, candidate_name: str):
+    match_rate, matched, missing = match_result
+    candidate_exp = profile["experience_years"]
     
     # 5. Scoring
     scores = calculate_scores(match_rate, candidate_exp, required_exp)
     
     # 6. Explainability
     explanation = generate_explanation(
-        "Candidate", matched, missing, candidate_exp, required_exp
+        candidate_name, matched, missing, candidate_exp, required_exp
     )
     
     return {
+        "profile_id": profile["profile_id"],
         "candidate_profile": {
-            "extracted_skills": list(resume_data["skills"]),
+            "extracted_skills": list(profile["entities"]["skills"]),
             "extracted_experience": candidate_exp
         },
         "scores": scores,
@@ -53,4 +131,615 @@ async def match_resume(
             "missing_skills": missing
         },
         "explanation": explanation
-    }
\ No newline at end of file
+    }
+
+
+def _match_pipeline(profile: dict, jd_text: str, required_exp: int, threshold: float = 0.5,
+                    candidate_name: str = "Candidate", resume_embeddings=None):
+    # 3. Extract Entities (JD) - cached by content hash
+    jd_skills, jd_embeddings = get_jd_profile(jd_text)
+    
+    # 4. Semantic Matching
+    match_result = semantic_match(
+        profile["entities"]["skills"], jd_skills, threshold=threshold,
+        jd_embeddings=jd_embeddings, resume_embeddings=resume_embeddings
+    )
+    
+    return _profile_result(profile, match_result, required_exp, candidate_name)
+
+
+async def _match_profile(profile: dict, jd_text: str, required_exp: int, threshold: float = 0.5,
+                         candidate_name: str = "Candidate"):
+    # Resume skills are embedded together with concurrent requests' skills
+    skills = profile["entities"]["skills"]
+    resume_embeddings = await embedding_batcher.submit(skills) if skills else None
+    return await run_inference(
+        _match_pipeline, profile, jd_text, required_exp, threshold, candidate_name, resume_embeddings
+    )
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    data = await file.read(MAX_DOCUMENT_BYTES + 1)
+    if len(data) > MAX_DOCUMENT_BYTES:
+        raise HTTPException(
+            status_code=413, detail=f"{file.filename} exceeds the {MAX_DOCUMENT_BYTES} byte limit"
+        )
+    metrics.observe("document_bytes", len(data), "upload")
+    return data
+
+
+async def _parse_document(data: bytes, filename: str, content_type: str = None) -> str:
+    # 1. Parse Resume in memory (parsing runs in the PDF process pool)
+    try:
+        with metrics.span("document_parse"):
+            if len(data) >= PDF_PARALLEL_MIN_BYTES and sniff_document_type(data, filename, content_type) == "pdf":
+                text = await _parse_pdf_parallel(data)
+            else:
+                text = await run_parse(extract_text, data, filename, content_type)
+    except UnsupportedDocumentError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Corrupt or truncated files fail inside the PDF/DOCX backends with their own error types
+        raise HTTPException(status_code=422, detail=f"Could not parse {filename}: {type(e).__name__}: {e}")
+    metrics.observe("document_chars", len(text), "resume")
+    return text
+
+
+async def _parse_pdf_parallel(data: bytes) -> str:
+    # Page ranges of one large PDF go to different parse processes, sharing one time budget
+    deadline = pdf_deadline()
+    ranges = await run_parse(pdf_page_ranges, data)
+    metrics.observe("document_pages", ranges[-1][1] if ranges else 0, "pdf")
+    parts = await asyncio.gather(*[
+        run_parse(extract_pdf_range, data, start, stop, None, deadline) for start, stop in ranges
+    ])
+    return clean_text("\n".join(parts))
+
+
+def _store_profiles(profile_ids: list, filenames: list, resume_texts: list, resumes_data: list):
+    # Persisted so re-scoring never runs NER again
+    profiles = []
+    for profile_id, filename, resume_text, resume_data in zip(
+        profile_ids, filenames, resume_texts, resumes_data
+    ):
+        candidate_exp = extract_years_of_experience(resume_text)
+        profile_store.put(profile_id, filename, resume_text, resume_data, candidate_exp)
+        profiles.append({
+            "profile_id": profile_id,
+            "filename": filename,
+            "resume_text": resume_text,
+            "entities": resume_data,
+            "experience_years": candidate_exp
+        })
+    return profiles
+
+
+async def _profiles_for_documents(documents: list) -> list:
+    """
+    Stored profile per (filename, content_type, bytes) document; only resumes
+    never seen before are parsed and run through NER
+    """
+    profile_ids = [profile_id_for(data) for _, _, data in documents]
+    profiles = [profile_store.get(profile_id) for profile_id in profile_ids]
+    
+    missing = [i for i, profile in enumerate(profiles) if profile is None]
+    metrics.inc("profile_store_hit", len(documents) - len(missing))
+    metrics.inc("profile_store_miss", len(missing))
+    if missing:
+        resume_texts = await asyncio.gather(*[
+            _parse_document(documents[i][2], documents[i][0], documents[i][1]) for i in missing
+        ])
+        # 2. Extract Entities (Resumes) - GLiNER batched across concurrent requests
+        resumes_data = await asyncio.gather(*[ner_batcher.submit(text) for text in resume_texts])
+        extracted = await run_inference(
+            _store_profiles, [profile_ids[i] for i in missing],
+            [documents[i][0] for i in missing], list(resume_texts), list(resumes_data)
+        )
+        for i, profile in zip(missing, extracted):
+            profiles[i] = profile
+    return profiles
+
+
+async def _load_profiles(files: list) -> list:
+    documents = [(file.filename, file.content_type, await _read_upload(file)) for file in files]
+    return await _profiles_for_documents(documents)
+
+
+@app.post("/match")
+async def match_resume(
+    file: UploadFile = File(...),
+    jd_text: str = Form(...),
+    required_exp: int = Form(2)
+):
+    async def _run():
+        profile = (await _load_profiles([file]))[0]
+        return await _match_profile(profile, jd_text, required_exp)
+    
+    async with admit():
+        return await with_deadline(_run())
+
+
+def _batch_pipeline(profiles: list, filenames: list, jd_text: str, required_exp: int):
+    # 3. Extract Entities (JD) - parsed once for the whole batch, cached by content hash
+    jd_skills, jd_embeddings = get_jd_profile(jd_text)
+    
+    # 4. Semantic Matching - one batched embedding pass
+    match_results = semantic_match_batch(
+        [profile["entities"]["skills"] for profile in profiles], jd_skills,
+        jd_embeddings=jd_embeddings
+    )
+    
+    # 5. Scoring + Explainability per candidate
+    results = []
+    for filename, profile, match_result in zip(filenames, profiles, match_results):
+        result = _profile_result(profile, match_result, required_exp, filename)
+        results.append({"filename": filename, **result})
+    
+    # 6. Rank by overall score
+    results.sort(key=lambda r: r["scores"]["overall_score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    
+    return {
+        "job_skills": jd_skills,
+        "total_candidates": len(results),
+        "results": results
+    }
+
+
+@app.post("/match/batch")
+async def match_resumes_batch(
+    files: List[UploadFile] = File(...),
+    jd_text: str = Form(...),
+    required_exp: int = Form(2)
+):
+    if len(files) > MAX_FILES_PER_REQUEST:
+        raise HTTPException(
+            status_code=422, detail=f"At most {MAX_FILES_PER_REQUEST} files per request, use /match/stream for more"
+        )
+    
+    async def _run():
+        profiles = await _load_profiles(files)
+        return await run_inference(
+            _batch_pipeline, profiles, [file.filename for file in files], jd_text, required_exp
+        )
+    
+    # The deadline grows with the batch; on expiry, parses and NER calls still queued are cancelled
+    async with admit():
+        return await with_deadline(_run(), batch_timeout(len(files)))
+
+
+def _parse_jobs(jobs: str, required_exp: int) -> list:
+    """jobs is a JSON list of JD strings or {"job_id", "jd_text", "required_exp"} objects"""
+    try:
+        parsed = json.loads(jobs)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="jobs must be a JSON list")
+    if not isinstance(parsed, list) or not parsed:
+        raise HTTPException(status_code=422, detail="jobs must be a non-empty JSON list")
+    if len(parsed) > MAX_JOBS_PER_REQUEST:
+        raise HTTPException(
+            status_code=422, detail=f"At most {MAX_JOBS_PER_REQUEST} jobs per request"
+        )
+    
+    normalized = []
+    for i, job in enumerate(parsed):
+        if isinstance(job, str):
+            job = {"jd_text": job}
+        if not isinstance(job, dict) or not isinstance(job.get("jd_text"), str) or not job["jd_text"].strip():
+            raise HTTPException(status_code=422, detail=f"jobs[{i}] needs a non-empty jd_text")
+        job_exp = job.get("required_exp", required_exp)
+        if isinstance(job_exp, bool) or not isinstance(job_exp, (int, float)) \
+                or not math.isfinite(job_exp) or job_exp < 0:
+            raise HTTPException(status_code=422, detail=f"jobs[{i}].required_exp must be a non-negative number")
+        normalized.append({
+            "job_id": str(job.get("job_id", i)),
+            "jd_text": job["jd_text"],
+            "required_exp": job_exp
+        })
+    return normalized
+
+
+def _multi_pipeline(profile: dict, jobs: list, threshold: float):
+    # 3. Extract Entities (JDs) - uncached JDs share one GLiNER batch
+    jd_profiles = get_jd_profiles([job["jd_text"] for job in jobs])
+    
+    # 4. Semantic Matching - resume encoded once, every JD in one similarity matrix
+    match_results = semantic_match_multi(
+        profile["entities"]["skills"], [jd_skills for jd_skills, _ in jd_profiles],
+        threshold=threshold, jd_embeddings_list=[jd_embeddings for _, jd_embeddings in jd_profiles]
+    )
+    
+    # 5. Scoring + Explainability per job
+    results = []
+    for job, (jd_skills, _), match_result in zip(jobs, jd_profiles, match_results):
+        result = _profile_result(profile, match_result, job["required_exp"], "Candidate")
+        results.append({
+            "job_id": job["job_id"],
+            "job_skills": jd_skills,
+            "scores": result["scores"],
+            "match_details": result["match_details"],
+            "explanation": result["explanation"]
+        })
+    
+    # 6. Rank requisitions by overall score
+    results.sort(key=lambda r: r["scores"]["overall_score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    
+    return {
+        "profile_id": profile["profile_id"],
+        "candidate_profile": {
+            "extracted_skills": profile["entities"]["skills"],
+            "extracted_experience": profile["experience_years"]
+        },
+        "total_jobs": len(results),
+        "results": results
+    }
+
+
+@app.post("/match/jobs")
+async def match_resume_to_jobs(
+    file: UploadFile = File(...),
+    jobs: str = Form(...),
+    required_exp: int = Form(2),
+    threshold: float = Form(0.5)
+):
+    # One candidate against many open requisitions
+    parsed_jobs = _parse_jobs(jobs, required_exp)
+    
+    async def _run():
+        profile = (await _load_profiles([file]))[0]
+        return await run_inference(_multi_pipeline, profile, parsed_jobs, threshold)
+    
+    async with admit():
+        return await with_deadline(_run())
+
+
+# ========== STREAMING BULK MATCH ==========
+def _is_archive_upload(file: UploadFile) -> bool:
+    return (file.filename or "").lower().endswith(".zip") or file.content_type in ZIP_CONTENT_TYPES
+
+
+async def _iter_documents(files: list):
+    """Yields (filename, content_type, bytes, error) one document at a time, unpacking ZIPs lazily"""
+    for file in files:
+        if not _is_archive_upload(file):
+            try:
+                yield file.filename, file.content_type, await _read_upload(file), None
+            except HTTPException as e:
+                yield file.filename, None, None, e.detail
+            continue
+        
+        members = iter_archive_documents(file.file)
+        while True:
+            try:
+                member = await asyncio.to_thread(next, members, None)
+            except zipfile.BadZipFile:
+                yield file.filename, None, None, f"{file.filename} is not a valid ZIP archive"
+                break
+            if member is None:
+                break
+            name, data, error = member
+            if data is not None:
+                metrics.observe("document_bytes", len(data), "archive_member")
+            yield name, None, data, error
+
+
+async def _match_document(filename: str, content_type: str, data: bytes,
+                          jd_text: str, required_exp: int, threshold: float):
+    profile = (await _profiles_for_documents([(filename, content_type, data)]))[0]
+    result = await _match_profile(profile, jd_text, required_exp, threshold, filename)
+    return {"filename": filename, **result}
+
+
+async def _stream_matches(files: list, jd_text: str, required_exp: int, threshold: float):
+    # The admission slot is reserved here, not in the endpoint: a generator that is
+    # never iterated (client gone before the response starts) never runs its finally
+    try:
+        async with admit():
+            async for line in _stream_lines(files, jd_text, required_exp, threshold):
+                yield line
+    except HTTPException as e:
+        # Saturated between the endpoint's capacity check and the first read
+        yield json.dumps({"filename": None, "error": e.detail}) + "\n"
+
+
+async def _stream_lines(files: list, jd_text: str, required_exp: int, threshold: float):
+    start = time.perf_counter()
+    queue = asyncio.Queue()
+    in_flight = asyncio.Semaphore(STREAM_MAX_IN_FLIGHT)
+    tasks = set()
+    
+    async def process(filename, content_type, data, error):
+        try:
+            if error is not None:
+                raise HTTPException(status_code=422, detail=error)
+            line = await with_deadline(
+                _match_document(filename, content_type, data, jd_text, required_exp, threshold)
+            )
+        except HTTPException as e:
+            line = {"filename": filename, "error": e.detail}
+        except Exception as e:
+            line = {"filename": filename, "error": f"{type(e).__name__}: {e}"}
+        await queue.put(line)
+    
+    async def produce():
+        # The semaphore is released when a line is streamed out, so a slow client throttles reading too
+        try:
+            async for document in _iter_documents(files):
+                await in_flight.acquire()
+                task = asyncio.create_task(process(*document))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            await in_flight.acquire()
+            await queue.put({"filename": None, "error": f"{type(e).__name__}: {e}"})
+        finally:
+            await queue.put(None)
+    
+    producer = asyncio.create_task(produce())
+    try:
+        # 3. Extract Entities (JD) - once for the whole upload, then served from the JD cache
+        jd_skills, _ = await run_inference(get_jd_profile, jd_text)
+        
+        succeeded = failed = 0
+        top = []
+        while (line := await queue.get()) is not None:
+            in_flight.release()
+            if "error" in line:
+                failed += 1
+            else:
+                succeeded += 1
+                entry = (line["scores"]["overall_score"], succeeded, line["filename"])
+                if len(top) < STREAM_TOP_K:
+                    heapq.heappush(top, entry)
+                else:
+                    heapq.heappushpop(top, entry)
+            yield json.dumps(line) + "\n"
+        
+        yield json.dumps({"summary": {
+            "job_skills": jd_skills,
+            "total": succeeded + failed,
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_s": round(time.perf_counter() - start, 3),
+            "top_candidates": [
+                {"filename": filename, "overall_score": score}
+                for score, _, filename in sorted(top, reverse=True)
+            ]
+        }}) + "\n"
+    finally:
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+
+@app.post("/match/stream")
+async def match_resumes_stream(
+    files: List[UploadFile] = File(...),
+    jd_text: str = Form(...),
+    required_exp: int = Form(2),
+    threshold: float = Form(0.5)
+):
+    """
+    Bulk match ZIP archives and/or many resume files against one JD.
+    Streams one NDJSON line per resume in completion order, then a summary line.
+    """
+    # 429 up front when saturated; the stream itself holds the slot while it runs
+    check_capacity()
+    return StreamingResponse(
+        _stream_matches(files, jd_text, required_exp, threshold),
+        media_type="application/x-ndjson"
+    )
+
+
+# ========== STORED PROFILES ==========
+def _profile_summary(profile: dict):
+    return {
+        "profile_id": profile["profile_id"],
+        "filename": profile["filename"],
+        "extracted_skills": profile["entities"]["skills"],
+        "extracted_experience": profile["experience_years"]
+    }
+
+
+def _get_profile(profile_id: str):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return profile
+
+
+@app.post("/profiles")
+async def add_profile(file: UploadFile = File(...)):
+    # Uploading the same bytes again returns the stored profile without a model pass
+    async def _run():
+        return _profile_summary((await _load_profiles([file]))[0])
+    
+    async with admit():
+        return await with_deadline(_run())
+
+
+@app.get("/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    return _profile_summary(_get_profile(profile_id))
+
+
+@app.post("/profiles/{profile_id}/match")
+async def match_profile(
+    profile_id: str,
+    jd_text: str = Form(...),
+    required_exp: int = Form(2),
+    threshold: float = Form(0.5)
+):
+    # Re-score a stored resume: no upload, no parsing, no GLiNER pass
+    profile = _get_profile(profile_id)
+    async with admit():
+        return await with_deadline(
+            _match_profile(profile, jd_text, required_exp, threshold)
+        )
+
+
+@app.post("/profiles/{profile_id}/match/jobs")
+async def match_profile_to_jobs(
+    profile_id: str,
+    jobs: str = Form(...),
+    required_exp: int = Form(2),
+    threshold: float = Form(0.5)
+):
+    profile = _get_profile(profile_id)
+    parsed_jobs = _parse_jobs(jobs, required_exp)
+    async with admit():
+        return await with_deadline(
+            run_inference(_multi_pipeline, profile, parsed_jobs, threshold)
+        )
+
+
+@app.delete("/profiles/{profile_id}")
+def remove_profile(profile_id: str):
+    if not profile_store.delete(profile_id):
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return {"removed": profile_id}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return {"jd_cache": jd_cache.stats()}
+
+
+def _index_candidate(candidate_id: str, filename: str, profile: dict):
+    skills = profile["entities"]["skills"]
+    candidate_exp = profile["experience_years"]
+    if not skills:
+        raise HTTPException(status_code=422, detail="No skills could be extracted from the resume")
+    
+    candidate_index.add(
+        candidate_id, skills, candidate_exp,
+        filename=filename, education=profile["entities"].get("education", [])
+    )
+    
+    return {
+        "candidate_id": candidate_id,
+        "profile_id": profile["profile_id"],
+        "extracted_skills": skills,
+        "extracted_experience": candidate_exp,
+        "total_candidates": len(candidate_index)
+    }
+
+
+@app.post("/candidates")
+async def add_candidate(
+    file: UploadFile = File(...),
+    candidate_id: Optional[str] = Form(None)
+):
+    # Adding with an existing candidate_id replaces that candidate
+    candidate_id = candidate_id or uuid.uuid4().hex
+    
+    async def _run():
+        profile = (await _load_profiles([file]))[0]
+        return await run_inference(_index_candidate, candidate_id, file.filename, profile)
+    
+    async with admit():
+        return await with_deadline(_run())
+
+
+@app.delete("/candidates/{candidate_id}")
+def remove_candidate(candidate_id: str):
+    if not candidate_index.remove(candidate_id):
+        raise HTTPException(status_code=404, detail=f"Unknown candidate: {candidate_id}")
+    return {"removed": candidate_id, "total_candidates": len(candidate_index)}
+
+
+def _search_candidates(jd_text: str, required_exp: int, top_k: int):
+    jd_skills, jd_embeddings = get_jd_profile(jd_text)
+    results = candidate_index.shortlist(
+        jd_skills, required_exp, k=top_k, jd_embeddings=jd_embeddings
+    )
+    return {
+        "job_skills": jd_skills,
+        "total_candidates": len(candidate_index),
+        "results": results
+    }
+
+
+@app.post("/candidates/search")
+async def search_candidates(
+    jd_text: str = Form(...),
+    required_exp: int = Form(2),
+    top_k: int = Form(20, ge=1)
+):
+    async with admit():
+        return await with_deadline(
+            run_inference(_search_candidates, jd_text, required_exp, top_k)
+        )
+
+
+def _rank_table(jd_text: str, threshold: float) -> ranking.CandidateTable:
+    key = (jd_text, threshold)
+    candidate_index.refresh()  # other workers may have changed the pool
+    with rank_tables_lock:
+        cached = rank_tables.get(key)
+    if cached is not None and cached[0] == candidate_index.version:
+        return cached[1]
+    
+    # Skill matching for the whole pool happens here, once per JD and pool version
+    version = candidate_index.version
+    jd_skills, jd_embeddings = get_jd_profile(jd_text)
+    table = ranking.CandidateTable.from_index(candidate_index, jd_skills, threshold, jd_embeddings)
+    
+    with rank_tables_lock:
+        rank_tables.pop(key, None)
+        rank_tables[key] = (version, table)
+        while len(rank_tables) > RANK_TABLE_CACHE_SIZE:
+            rank_tables.pop(next(iter(rank_tables)))
+    return table
+
+
+def _parse_weights(weights: Optional[str]) -> Optional[dict]:
+    if weights is None:
+        return None
+    try:
+        parsed = json.loads(weights)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=422, detail="weights must be a JSON object")
+    if not isinstance(parsed, dict) or not all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) for value in parsed.values()
+    ):
+        raise HTTPException(status_code=422, detail="weights must map factor names to numbers")
+    if not all(math.isfinite(value) and value >= 0 for value in parsed.values()):
+        raise HTTPException(status_code=422, detail="weights must be finite and non-negative")
+    return parsed
+
+
+def _rank_candidates(jd_text: str, required_exp: int, top_k: int, threshold: float, weights: Optional[dict]):
+    table = _rank_table(jd_text, threshold)
+    try:
+        results = ranking.rank(table, weights, required_exp, k=top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "total_candidates": len(table),
+        "results": results
+    }
+
+
+@app.post("/candidates/rank")
+async def rank_candidates(
+    jd_text: str = Form(...),
+    required_exp: int = Form(2),
+    top_k: int = Form(20, ge=1),
+    threshold: float = Form(0.5),
+    weights: Optional[str] = Form(None)
+):
+    # Re-weighting the same JD reuses the cached feature table: only the NumPy ranking reruns
+    parsed_weights = _parse_weights(weights)
+    async with admit():
+        return await with_deadline(
+            run_inference(_rank_candidates, jd_text, required_exp, top_k, threshold, parsed_weights)
+        )
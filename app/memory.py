@@ -0,0 +1,67 @@
+"""
+Per-process memory report for the serving processes (Linux /proc).
+
+RSS counts shared pages once per process, so N workers that share
+preloaded model weights look like N full copies. PSS splits each shared
+page between the processes mapping it, and Private_* is what a worker
+really costs. Summing PSS over the master and its workers gives the node's
+actual footprint.
+
+    python -m app.memory [MASTER_PID]     # master + worker processes
+    GET /memory                           # the serving process and its siblings
+"""
+import json
+import os
+import sys
+
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty", "Swap")
+
+
+def process_memory(pid: int) -> dict:
+    """smaps_rollup of one process in MiB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in FIELDS:
+                values[key] = int(rest.split()[0])  # kB
+    with open(f"/proc/{pid}/comm") as f:
+        name = f.read().strip()
+    report = {"pid": pid, "name": name}
+    report.update({f"{key.lower()}_mb": round(values.get(key, 0) / 1024, 1) for key in FIELDS})
+    report["private_mb"] = round(report["private_clean_mb"] + report["private_dirty_mb"], 1)
+    return report
+
+
+def child_pids(pid: int) -> list:
+    children = []
+    task_dir = f"/proc/{pid}/task"
+    for tid in os.listdir(task_dir):
+        try:
+            with open(os.path.join(task_dir, tid, "children")) as f:
+                children.extend(int(child) for child in f.read().split())
+        except FileNotFoundError:
+            continue
+    return sorted(set(children))
+
+
+def memory_report(master_pid: int = None) -> dict:
+    """Master + direct children (gunicorn workers, parse pool processes)"""
+    master_pid = master_pid or os.getpid()
+    processes = []
+    for pid in [master_pid] + child_pids(master_pid):
+        try:
+            processes.append(process_memory(pid))
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue  # exited while we were reading
+
+    return {
+        "master_pid": master_pid,
+        "processes": processes,
+        "total_rss_mb": round(sum(p["rss_mb"] for p in processes), 1),
+        "total_pss_mb": round(sum(p["pss_mb"] for p in processes), 1)
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(memory_report(int(sys.argv[1]) if len(sys.argv) > 1 else None), indent=2))
@@ -0,0 +1,145 @@
+"""
+Lightweight in-process instrumentation with Prometheus text exposition.
+
+    with span("gliner"):
+        ...
+    @timed("scoring")
+    def calculate_scores(...): ...
+    inc("fallback_parser")
+    observe("document_chars", len(text))
+
+Everything is a dict update under one lock, so it is cheap enough for the
+hot path. Metrics are per process; scrape each worker to aggregate.
+"""
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+PREFIX = "resume_matcher"
+
+# Seconds, tuned for stages that range from microseconds (scoring) to seconds (GLiNER on long CVs)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+SIZE_BUCKETS = (1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 1_000_000, 10_000_000)
+
+HISTOGRAMS = {
+    # name: (help, label name, buckets)
+    "stage_seconds": ("Time spent per pipeline stage", "stage", LATENCY_BUCKETS),
+    "http_request_seconds": ("HTTP request latency by route", "route", LATENCY_BUCKETS),
+    "document_chars": ("Extracted text length per document", "kind", SIZE_BUCKETS),
+    "document_bytes": ("Uploaded document size", "kind", SIZE_BUCKETS),
+    "document_pages": ("Pages per document parsed page-parallel", "kind", BATCH_BUCKETS),
+    "batch_size": ("Items per micro-batched model call", "batcher", BATCH_BUCKETS),
+}
+COUNTER_HELP = {
+    "events_total": "Pipeline events (fallback parser activations, cache hits/misses, ...)",
+    "http_responses_total": "HTTP responses by route and status code",
+}
+
+_lock = threading.Lock()
+_histograms = {}  # (name, label value) -> [bucket counts..., +Inf count, sum]
+_counters = {}    # (name, labels tuple) -> value
+
+
+def observe(name: str, value: float, label: str = ""):
+    buckets = HISTOGRAMS[name][2]
+    index = bisect.bisect_left(buckets, value)
+    with _lock:
+        series = _histograms.get((name, label))
+        if series is None:
+            series = _histograms[(name, label)] = [0] * (len(buckets) + 1) + [0.0]
+        series[index] += 1
+        series[-1] += value
+
+
+def count(name: str, amount: int = 1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def inc(event: str, amount: int = 1):
+    """Bump events_total{event=...}"""
+    count("events_total", amount, event=event)
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block into stage_seconds{stage=...}"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe("stage_seconds", time.perf_counter() - start, stage)
+
+
+def timed(stage: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    """Counts and sums as plain dicts (for JSON debugging endpoints and tests)"""
+    with _lock:
+        return {
+            "histograms": {
+                f"{name}{{{label}}}": {"count": sum(series[:-1]), "sum": round(series[-1], 6)}
+                for (name, label), series in _histograms.items()
+            },
+            "counters": {
+                f"{name}{dict(labels)}": value for (name, labels), value in _counters.items()
+            }
+        }
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def render_prometheus() -> str:
+    lines = []
+    with _lock:
+        histograms = {key: list(series) for key, series in _histograms.items()}
+        counters = dict(_counters)
+
+    for name, (help_text, label_name, buckets) in HISTOGRAMS.items():
+        series_for_name = {label: s for (n, label), s in histograms.items() if n == name}
+        if not series_for_name:
+            continue
+        metric = f"{PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for label, series in sorted(series_for_name.items()):
+            cumulative = 0
+            for bound, observations in zip(list(buckets) + ["+Inf"], series[:-1]):
+                cumulative += observations
+                lines.append(f'{metric}_bucket{{{label_name}="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{label_name}="{label}"}} {series[-1]}')
+            lines.append(f'{metric}_count{{{label_name}="{label}"}} {cumulative}')
+
+    for name, help_text in COUNTER_HELP.items():
+        series_for_name = {labels: v for (n, labels), v in counters.items() if n == name}
+        if not series_for_name:
+            continue
+        metric = f"{PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for labels, value in sorted(series_for_name.items()):
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
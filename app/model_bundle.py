@@ -0,0 +1,107 @@
+"""
+Local model bundle + background warmup.
+
+Build a bundle once (e.g. at image build time):
+    python -m app.model_bundle /models
+
+then run with MODEL_DIR=/models so no pod ever downloads weights.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+MODEL_DIR = os.getenv("MODEL_DIR", "")
+GLINER_MODEL_NAME = os.getenv("GLINER_MODEL", "urchade/gliner_medium-v2.1")
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+logger = logging.getLogger(__name__)
+
+
+def bundle_path(model_name: str, model_dir: str = MODEL_DIR) -> str:
+    return os.path.join(model_dir, model_name.split("/")[-1])
+
+
+def resolve_model(model_name: str):
+    """Returns (path_or_hub_id, is_local) preferring the baked bundle"""
+    if MODEL_DIR:
+        local = bundle_path(model_name)
+        if os.path.isdir(local):
+            return local, True
+        logger.warning("%s not found in model bundle, falling back to the hub", local)
+    return model_name, False
+
+
+# ========== WARMUP / READINESS ==========
+_warmup_state = {"status": "not_started", "error": None, "seconds": None}
+_warmup_lock = threading.Lock()
+
+
+def warmup():
+    """Load both models (blocking). Safe to call more than once."""
+    from app.ner_model import get_model
+    from app.skill_matcher import get_embedder
+    from app.skill_ontology import get_ontology
+
+    start = time.perf_counter()
+    _warmup_state["status"] = "loading"
+    try:
+        get_model()
+        get_embedder()
+        # Canonical-skill matrix too, so preloading shares it across workers
+        get_ontology().matrix()
+    except Exception as e:
+        _warmup_state["status"] = "failed"
+        _warmup_state["error"] = str(e)
+        raise
+    _warmup_state["status"] = "ready"
+    _warmup_state["seconds"] = round(time.perf_counter() - start, 2)
+
+
+def start_background_warmup():
+    with _warmup_lock:
+        if _warmup_state["status"] != "not_started":
+            return
+        _warmup_state["status"] = "loading"
+
+    def _run():
+        try:
+            warmup()
+        except Exception as e:
+            logger.error("Model warmup failed: %s", e)
+
+    threading.Thread(target=_run, name="model-warmup", daemon=True).start()
+
+
+def readiness():
+    from app.ner_model import is_model_loaded
+    from app.skill_matcher import is_embedder_loaded
+
+    models = {"gliner": is_model_loaded(), "embedder": is_embedder_loaded()}
+    return {
+        "ready": all(models.values()),
+        "models": models,
+        "warmup": dict(_warmup_state)
+    }
+
+
+# ========== BUNDLE BUILDER ==========
+def build_bundle(target_dir: str):
+    """Download both models and save them (safetensors where supported) under target_dir"""
+    from gliner import GLiNER
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(target_dir, exist_ok=True)
+
+    gliner_path = bundle_path(GLINER_MODEL_NAME, target_dir)
+    print(f"Saving {GLINER_MODEL_NAME} -> {gliner_path}")
+    GLiNER.from_pretrained(GLINER_MODEL_NAME).save_pretrained(gliner_path)
+
+    embedder_path = bundle_path(EMBEDDING_MODEL_NAME, target_dir)
+    print(f"Saving {EMBEDDING_MODEL_NAME} -> {embedder_path}")
+    SentenceTransformer(EMBEDDING_MODEL_NAME).save(embedder_path, safe_serialization=True)
+
+
+if __name__ == "__main__":
+    build_bundle(sys.argv[1] if len(sys.argv) > 1 else (MODEL_DIR or "models"))
@@ -1,28 +1,199 @@
-from gliner import GLiNER
+import logging
+import os
 import re
+import threading
+from app import metrics
+from app.model_bundle import GLINER_MODEL_NAME, resolve_model
+from app.inference_backend import load_gliner
+from app.experience import total_years_of_experience
+from app.gazetteer import get_gazetteer
+from app.sections import segment_resume, section_text, split_items
+from app.skill_ontology import get_ontology
 
-# Load model once
-model = GLiNER.from_pretrained("urchade/gliner_medium-v2.1")
+# Loaded lazily (or by the startup warmup) so importing this module is cheap
+_model = None
+_model_lock = threading.Lock()
+logger = logging.getLogger(__name__)
 labels = ["person", "skill", "role", "experience", "education", "company", "tool"]
 
-def extract_entities(text: str):
+
+def get_model():
+    """Load GLiNER once (local bundle when MODEL_DIR provides it, INFERENCE_BACKEND applied)"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                path, is_local = resolve_model(GLINER_MODEL_NAME)
+                _model = load_gliner(path, is_local)
+    return _model
+
+
+def is_model_loaded() -> bool:
+    return _model is not None
+
+
+# ========== CHUNKING ==========
+# GLiNER silently truncates past its max_len (384 word tokens for v2.1), so long
+# resumes are split into overlapping windows that each fit the budget.
+CHUNK_MAX_WORDS = int(os.getenv("NER_CHUNK_WORDS", "300"))
+CHUNK_OVERLAP_WORDS = int(os.getenv("NER_CHUNK_OVERLAP", "50"))
+NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", "16"))
+
+# Same word splitting GLiNER uses internally, so the budget matches its token count
+_WORD_RE = re.compile(r'\w+(?:[-_]\w+)*|\S')
+
+
+def chunk_text(text: str, max_words: int = CHUNK_MAX_WORDS, overlap: int = CHUNK_OVERLAP_WORDS):
+    """Split text into overlapping windows of at most max_words; returns [(char_offset, chunk)]"""
+    words = [m.span() for m in _WORD_RE.finditer(text)]
+    if len(words) <= max_words:
+        return [(0, text)]
+
+    chunks = []
+    step = max(1, max_words - overlap)
+    for first in range(0, len(words), step):
+        last = min(first + max_words, len(words)) - 1
+        start, end = words[first][0], words[last][1]
+        chunks.append((start, text[start:end]))
+        if last == len(words) - 1:
+            break
+    return chunks
+
+
+def _merge_spans(spans: list):
+    """Dedupe spans found in overlapping windows: keep the best-scoring span per overlap and label"""
+    merged = []
+    for span in sorted(spans, key=lambda e: (e["label"], e["start"], -e["score"])):
+        previous = merged[-1] if merged else None
+        if previous and previous["label"] == span["label"] and span["start"] < previous["end"]:
+            if span["score"] > previous["score"]:
+                merged[-1] = span
+            continue
+        merged.append(span)
+    return sorted(merged, key=lambda e: e["start"])
+
+
+# ========== SECTION ROUTING ==========
+# Sections routed to GLiNER with only the labels that can occur in them; the
+# header and any other section (languages, awards, ...) get every label
+SECTION_LABELS = {
+    "summary": ["skill", "tool", "role", "experience"],
+    "skills": ["skill", "tool"],
+    "experience": ["skill", "tool", "role", "company", "experience"],
+    "projects": ["skill", "tool"],
+    "education": ["education"],
+    "certifications": ["certification"],
+}
+# Headings the segmenter does not know ("Requirements:", "RESPONSIBILITIES") start a
+# block that goes to GLiNER with every label rather than inheriting its neighbour's
+_OTHER_HEADING = re.compile(r'^[ \t]*(?:[A-Z][A-Za-z&/ ]{2,40}:|[A-Z][A-Z&/ ]{2,40}[ \t]*$)', re.MULTILINE)
+
+
+def _split_other_headings(offset: int, body: str, section_labels: list):
+    starts = [m.start() for m in _OTHER_HEADING.finditer(body) if m.start() > 0]
+    bounds = [0] + starts + [len(body)]
+    return [
+        (offset + start, body[start:end], section_labels if i == 0 else labels)
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+        if body[start:end].strip()
+    ]
+
+
+def ner_inputs(text: str, segment: bool = True):
+    """
+    [(char_offset, text, labels)] to run GLiNER on. Resumes (segment=True) are
+    routed by section; job descriptions and unsegmented text go in whole.
+    """
+    sections = segment_resume(text) if segment else ()
+    if not sections:
+        return [(0, text, labels)]
+
+    inputs = []
+    for section in sections:
+        body = text[section.start:section.end]
+        if section.name in SECTION_LABELS:
+            inputs.extend(_split_other_headings(section.start, body, SECTION_LABELS[section.name]))
+        else:
+            # Header (name/contact block, untitled summary) or a section with no routing
+            inputs.append((section.start, body, labels))
+    return inputs
+
+
+def predict_entities_chunked(texts: list, threshold: float = 0.3, segment: bool = True):
+    """
+    Run GLiNER over every chunk of every routed section of every text in
+    batched forward passes (one pass per label set), then map spans back
+    to document offsets. Returns one span list per text.
+    """
+    chunks_by_labels = {}  # labels -> [(doc_index, char_offset, chunk_text)]
+    for i, text in enumerate(texts):
+        for section_offset, section, section_labels in ner_inputs(text, segment):
+            for offset, chunk in chunk_text(section):
+                chunks_by_labels.setdefault(tuple(section_labels), []).append((i, section_offset + offset, chunk))
+
+    model = get_model()
+    spans = [[] for _ in texts]
+    for label_set, chunks in chunks_by_labels.items():
+        for b in range(0, len(chunks), NER_BATCH_SIZE):
+            batch = chunks[b:b + NER_BATCH_SIZE]
+            predictions = model.batch_predict_entities([c[2] for c in batch], list(label_set), threshold=threshold)
+            for (i, offset, chunk), entities in zip(batch, predictions):
+                metrics.observe("document_chars", len(chunk), "ner_routed")
+                _collect_spans(spans[i], texts[i], offset, entities)
+
+    return [_merge_spans(doc_spans) for doc_spans in spans]
+
+
+def _collect_spans(doc_spans: list, text: str, offset: int, entities: list):
+    for entity in entities:
+        start, end = entity["start"] + offset, entity["end"] + offset
+        doc_spans.append({
+            **entity,
+            "start": start,
+            "end": end,
+            "text": text[start:end]
+        })
+
+
+def extract_entities(text: str, segment: bool = False):
+    """
+    Hybrid entity extractor: Uses GLiNER + rule-based fallback.
+    segment=True routes resume sections to GLiNER with section-specific labels.
+    """
+    return extract_entities_batch([text], segment)[0]
+
+
+def extract_entities_batch(texts: list, segment: bool = False):
     """
-    Hybrid entity extractor: Uses GLiNER + rule-based fallback
+    Batched version of extract_entities: all chunks of all texts share GLiNER forward passes
     """
-    print(f"\n🔍 NER: Processing {len(text)} characters")
+    texts = list(texts)
+    if not texts:
+        return []
+    
+    for text in texts:
+        metrics.observe("document_chars", len(text), "ner_input")
     
     # Try GLiNER first
     try:
-        entities = model.predict_entities(text, labels, threshold=0.3)  # Lower threshold
+        with metrics.span("gliner"):
+            batch_entities = predict_entities_chunked(texts, threshold=0.3, segment=segment)  # Lower threshold
     except Exception as e:
-        print(f"GLiNER error: {e}")
-        entities = []
+        logger.warning("GLiNER error: %s", e)
+        metrics.inc("gliner_error")
+        batch_entities = [[] for _ in texts]
     
+    return [_structure_entities(text, entities) for text, entities in zip(texts, batch_entities)]
+
+
+def _structure_entities(text: str, entities: list):
+    """Turn raw GLiNER spans into the structured profile, applying the fallbacks"""
     structured_data = {
         "skills": set(),
         "roles": [],
         "experience": [],
         "education": [],
+        "certifications": [],
         "companies": []
     }
     
@@ -39,16 +210,37 @@ def extract_entities(text: str):
             structured_data["companies"].append(text_val)
         elif tag == "experience":
             structured_data["experience"].append(text_val)
+        elif tag == "education":
+            structured_data["education"].append(text_val)
+        elif tag == "certification":
+            structured_data["certifications"].append(text_val)
+    
+    logger.debug("GLiNER found %d skills", len(structured_data["skills"]))
     
-    print(f"GLiNER found {len(structured_data['skills'])} skills")
+    # ========== GAZETTEER ==========
+    # Taxonomy matching is a single linear pass, so it runs on every document
+    with metrics.span("gazetteer"):
+        structured_data["skills"].update(get_gazetteer().extract(text))
     
     # ========== FALLBACK PARSER ==========
-    # If GLiNER didn't find skills, use rule-based extraction
+    # If GLiNER + gazetteer didn't find skills, use rule-based extraction
     if len(structured_data["skills"]) < 3:  # If too few skills found
-        print("⚠️ GLiNER found few skills, using fallback parser...")
-        fallback_skills = extract_skills_fallback(text)
+        logger.debug("Few skills found, using fallback parser")
+        metrics.inc("fallback_parser")
+        with metrics.span("fallback_parser"):
+            fallback_skills = extract_skills_fallback(text)
         structured_data["skills"].update(fallback_skills)
     
+    # ========== CANONICALIZATION ==========
+    # "ms excel", "excel spreadsheets" -> "microsoft excel": one name (and id) per known skill
+    with metrics.span("canonicalize"):
+        try:
+            structured_data["skills"] = get_ontology().canonical_names(sorted(structured_data["skills"]))
+        except Exception as e:
+            # Alias lookup needs no model; only the nearest-neighbour step does
+            logger.warning("Skill canonicalization error: %s", e)
+            structured_data["skills"] = get_ontology().canonical_names(sorted(structured_data["skills"]), nn_threshold=1.0)
+    
     # Extract experience years specifically
     experience_years = extract_experience_years(text)
     if experience_years > 0:
@@ -58,6 +250,13 @@ def extract_entities(text: str):
     if "university" in text.lower() or "b.a." in text.lower() or "bachelor" in text.lower():
         structured_data["education"].append("Bachelor's Degree")
     
+    # Certifications section entries are usually one certification per item
+    certifications_section = section_text(text, "certifications")
+    if certifications_section:
+        structured_data["certifications"].extend(
+            item for item in split_items(certifications_section) if len(item) <= 80
+        )
+    
     # Convert skills set to list and format properly
     formatted_skills = []
     for skill in structured_data["skills"]:
@@ -65,76 +264,68 @@ def extract_entities(text: str):
         formatted = ' '.join(word.capitalize() for word in str(skill).split())
         formatted_skills.append(formatted)
     
-    print(f"📊 Total skills found: {len(formatted_skills)}")
-    if formatted_skills:
-        print(f"Skills: {formatted_skills[:10]}...")
+    logger.debug("Total skills found: %d %s", len(formatted_skills), formatted_skills[:10])
     
     return {
         "skills": formatted_skills,
         "experience": structured_data["experience"],
-        "education": structured_data["education"],
-        "certifications": []
+        "education": list(dict.fromkeys(structured_data["education"])),
+        "certifications": list(dict.fromkeys(structured_data["certifications"]))
     }
 
 
 def extract_skills_fallback(text: str):
-    """Rule-based skill extraction for when GLiNER fails"""
+    """Rule-based skill extraction for when GLiNER + gazetteer find too little"""
     skills = set()
     text_lower = text.lower()
     
-    # Skills from your specific resume
-    resume_skills = [
-        "problem solving", "adaptability", "collaboration", 
-        "strong work ethic", "time management", "critical thinking",
-        "handling pressure", "leadership", "microsoft excel",
-        "organization", "scheduling", "travel arrangements",
-        "budgeting", "reporting", "confidentiality", "communication",
-        "teamwork", "administrative", "secretarial", "training",
-        "mentoring", "filing", "documentation", "correspondence",
-        "office supplies", "inventory", "meeting minutes"
-    ]
-    
-    # Direct matching
-    for skill in resume_skills:
-        if skill in text_lower:
-            skills.add(skill)
+    # Known skill names are matched by the gazetteer (app/gazetteer.py);
+    # this only recovers unlisted skills from the layout of the document
     
-    # Extract from SKILL section (your resume format)
     lines = text.split('\n')
-    for i, line in enumerate(lines):
-        line_upper = line.upper().strip()
-        
-        # Find SKILL section
-        if 'SKILL' in line_upper and len(line_upper) < 20:
-            # Skills might be on same line or next line
-            skill_line = line
-            
-            # Check next line if current line is just "SKILL"
-            if line_upper == "SKILL" and i + 1 < len(lines):
-                skill_line = lines[i + 1]
-            
-            # Parse concatenated skills like "Problem Solving Adaptability"
-            words = skill_line.split()
-            current_skill = []
+    
+    # Skills section from the segmenter; without one, look for a SKILL header line (your resume format)
+    skills_section = section_text(text, "skills")
+    if skills_section is not None:
+        skill_lines = skills_section.split('\n')
+        # Delimited lists ("Python, SQL; Tableau") give the skills directly
+        skills.update(item.lower() for item in split_items(skills_section) if len(item.split()) <= 4)
+    else:
+        skill_lines = []
+        for i, line in enumerate(lines):
+            line_upper = line.upper().strip()
             
-            for word in words:
-                if word[0].isupper() or word.isupper():
-                    current_skill.append(word)
-                    # If we have 2-3 capitalized words, that's a skill
-                    if len(current_skill) >= 2 and len(current_skill) <= 3:
-                        skill_name = ' '.join(current_skill)
-                        skills.add(skill_name.lower())
-                        current_skill = [word]  # Start new skill with current word
+            # Find SKILL section
+            if 'SKILL' in line_upper and len(line_upper) < 20:
+                # Skills might be on same line or next line; check next line if current line is just "SKILL"
+                if line_upper == "SKILL" and i + 1 < len(lines):
+                    skill_lines.append(lines[i + 1])
                 else:
-                    if current_skill and len(current_skill) >= 2:
-                        skill_name = ' '.join(current_skill)
-                        skills.add(skill_name.lower())
-                    current_skill = []
-            
-            # Add any remaining skill
-            if current_skill and len(current_skill) >= 2:
-                skill_name = ' '.join(current_skill)
-                skills.add(skill_name.lower())
+                    skill_lines.append(line)
+    
+    for skill_line in skill_lines:
+        # Parse concatenated skills like "Problem Solving Adaptability"
+        words = skill_line.split()
+        current_skill = []
+        
+        for word in words:
+            if word[0].isupper() or word.isupper():
+                current_skill.append(word)
+                # If we have 2-3 capitalized words, that's a skill
+                if len(current_skill) >= 2 and len(current_skill) <= 3:
+                    skill_name = ' '.join(current_skill)
+                    skills.add(skill_name.lower())
+                    current_skill = [word]  # Start new skill with current word
+            else:
+                if current_skill and len(current_skill) >= 2:
+                    skill_name = ' '.join(current_skill)
+                    skills.add(skill_name.lower())
+                current_skill = []
+        
+        # Add any remaining skill
+        if current_skill and len(current_skill) >= 2:
+            skill_name = ' '.join(current_skill)
+            skills.add(skill_name.lower())
     
     # Extract from job descriptions
     if any(keyword in text_lower for keyword in ["looking for", "required", "qualifications", "skills:"]):
@@ -150,33 +341,8 @@ def extract_skills_fallback(text: str):
 
 
 def extract_experience_years(text: str) -> int:
-    """Extract years of experience from text"""
-    text_lower = text.lower()
-    
-    # Pattern 1: Explicit years mentioned
-    patterns = [r'(\d+)\+?\s*years?', r'(\d+)\s*yr', r'experience.*?(\d+)', r'(\d+).*?experience']
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text_lower)
-        for match in matches:
-            try:
-                return int(match)
-            except:
-                pass
-    
-    # Pattern 2: Calculate from dates in your resume
-    # Your resume: Sep 2018-Present and Jun 2015-Aug 2018
-    date_pattern = r'(\d{4})\s*[-–]\s*(?:Present|\d{4})'
-    dates = re.findall(date_pattern, text)
-    
-    if dates:
-        try:
-            earliest = min([int(date) for date in dates])
-            return 2026 - earliest  # Update year as needed
-        except:
-            return 6  # Default
-    
-    return 6  # Default from resume text saying "6+ years"
+    """Extract years of experience from text (shared scanner, see app/experience.py)"""
+    return int(round(total_years_of_experience(text, tenure_text=section_text(text, "experience"))))
 
 
 # Test function
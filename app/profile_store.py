@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+PROFILE_STORE_PATH = os.getenv(
+    "PROFILE_STORE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume_matcher", "profiles.sqlite3")
+)
+
+# Bump when extraction changes so stale profiles are re-parsed instead of reused
+PROFILE_VERSION = 6
+
+
+def profile_id_for(data: bytes) -> str:
+    """Content address of the raw resume bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ProfileStore:
+    """
+    SQLite store of parsed resumes keyed by the SHA-256 of the uploaded bytes.
+
+    Holds the output of text extraction, extract_entities and
+    extract_years_of_experience so re-scoring a resume against a new JD,
+    threshold or experience requirement never runs the models again.
+    """
+
+    def __init__(self, path: str = PROFILE_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS profiles (
+                    profile_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    filename TEXT,
+                    resume_text TEXT NOT NULL,
+                    entities TEXT NOT NULL,
+                    experience_years REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self):
+        # One connection per thread (and per process: connections must not cross a fork,
+        # e.g. gunicorn preload); WAL lets API workers read while another writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, profile_id: str):
+        row = self._connect().execute(
+            "SELECT filename, resume_text, entities, experience_years, created_at "
+            "FROM profiles WHERE profile_id = ? AND version = ?",
+            (profile_id, PROFILE_VERSION)
+        ).fetchone()
+        if row is None:
+            return None
+        filename, resume_text, entities, experience_years, created_at = row
+        return {
+            "profile_id": profile_id,
+            "filename": filename,
+            "resume_text": resume_text,
+            "entities": json.loads(entities),
+            "experience_years": experience_years,
+            "created_at": created_at
+        }
+
+    def put(self, profile_id: str, filename: str, resume_text: str,
+            entities: dict, experience_years: float):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (profile_id, PROFILE_VERSION, filename, resume_text,
+                 json.dumps(entities), float(experience_years), time.time())
+            )
+
+    def delete(self, profile_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM profiles WHERE profile_id = ?", (profile_id,))
+            return cursor.rowcount > 0
+
+    def __len__(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM profiles WHERE version = ?", (PROFILE_VERSION,)
+        ).fetchone()[0]
@@ -0,0 +1,123 @@
+"""
+Vectorized re-ranking of already-parsed candidates.
+
+    table = CandidateTable.from_index(candidate_index, jd_skills, jd_embeddings=jd_embeddings)
+    top = rank(table, {"skill": 0.5, "experience": 0.3, "education": 0.2}, required_exp=3, k=20)
+
+The JD-dependent work (skill matching) happens once when the table is built.
+After that, any weight vector re-ranks the whole pool with a few NumPy
+operations and an argpartition for the top k. With DEFAULT_WEIGHTS the scores
+are identical to calculate_scores.
+"""
+import math
+
+import numpy as np
+
+from app import metrics
+from app.scoring import DEFAULT_WEIGHTS
+
+# Factors a weight vector may use; each is scored 0-100
+FEATURES = ("skill", "experience", "education")
+
+# Candidates per semantic_match_batch call when building a table
+RANK_MATCH_BATCH = 256
+
+
+class CandidateTable:
+    """Columnar candidate features: one NumPy array per feature, row i <-> candidate_ids[i]"""
+
+    def __init__(self, candidate_ids: list, skill_match_rate, experience_years, has_education):
+        self.candidate_ids = list(candidate_ids)
+        self.skill_match_rate = np.asarray(skill_match_rate, dtype=np.float64)
+        self.experience_years = np.asarray(experience_years, dtype=np.float64)
+        self.has_education = np.asarray(has_education, dtype=bool)
+
+    def __len__(self):
+        return len(self.candidate_ids)
+
+    @classmethod
+    def from_index(cls, candidate_index, jd_skills: list, threshold=0.5, jd_embeddings=None):
+        """Match every indexed candidate against one JD (in batches) and keep only the features"""
+        # Imported here: ranking a built table needs no embedding model
+        from app.skill_matcher import semantic_match_batch
+
+        entries = candidate_index.entries()
+
+        match_rates = []
+        with metrics.span("rank_features"):
+            for start in range(0, len(entries), RANK_MATCH_BATCH):
+                batch = entries[start:start + RANK_MATCH_BATCH]
+                results = semantic_match_batch(
+                    [entry["skills"] for _, entry in batch], jd_skills,
+                    threshold=threshold, jd_embeddings=jd_embeddings
+                )
+                match_rates.extend(match_rate for match_rate, _, _ in results)
+
+        return cls(
+            [candidate_id for candidate_id, _ in entries],
+            match_rates,
+            [entry["experience"] for _, entry in entries],
+            [bool(entry.get("education")) for _, entry in entries]
+        )
+
+
+def _check_weights(weights: dict) -> dict:
+    unknown = set(weights) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown scoring factors: {sorted(unknown)} (expected some of {list(FEATURES)})")
+    weights = {feature: float(weights.get(feature, 0.0)) for feature in FEATURES}
+    # Scores are at most 100, so a finite 100 * total keeps every weighted sum finite
+    if not all(math.isfinite(w) and w >= 0 for w in weights.values()) or not math.isfinite(100 * sum(weights.values())):
+        raise ValueError(f"Weights must be non-negative and small enough to keep scores finite: {weights}")
+    return weights
+
+
+def feature_scores(table: CandidateTable, required_exp=2.0) -> dict:
+    """Per-factor scores (0-100) for every candidate, computed like calculate_scores"""
+    if required_exp > 0:
+        exp_score = np.where(
+            table.experience_years >= required_exp,
+            100.0,
+            (table.experience_years / required_exp) * 100
+        )
+    else:
+        exp_score = np.full(len(table), 100.0)
+
+    return {
+        "skill": table.skill_match_rate * 100,
+        "experience": exp_score,
+        "education": table.has_education * 100.0
+    }
+
+
+@metrics.timed("ranking")
+def rank(table: CandidateTable, weights: dict = None, required_exp=2.0, k: int = None) -> list:
+    """Top-k candidates under the given weights, best first"""
+    weights = _check_weights(DEFAULT_WEIGHTS if weights is None else weights)
+    if not len(table):
+        return []
+
+    scores = feature_scores(table, required_exp)
+
+    # Weighted sum term by term in FEATURES order (same float operations as calculate_scores)
+    overall = np.zeros(len(table))
+    for feature in FEATURES:
+        if weights[feature]:
+            overall = overall + scores[feature] * weights[feature]
+
+    # Partial sort: argpartition picks the k best in O(n), only those k are sorted
+    k = len(table) if k is None else max(0, min(k, len(table)))
+    top = np.argpartition(-overall, k - 1)[:k] if 0 < k < len(table) else np.arange(k)
+    top = top[np.lexsort((top, -overall[top]))]
+
+    shown = [feature for feature in FEATURES if weights[feature] or feature in DEFAULT_WEIGHTS]
+    return [
+        {
+            "candidate_id": table.candidate_ids[i],
+            "scores": {
+                **{f"{feature}_score": round(float(scores[feature][i]), 1) for feature in shown},
+                "overall_score": round(float(overall[i]), 1)
+            }
+        }
+        for i in top
+    ]
@@ -1,6 +1,36 @@
 import pdfplumber
 import docx
+import io
+import logging
+import os
 import re
+import time
+import zipfile
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # optional fast backend
+    pdfium = None
+
+MAX_DOCUMENT_BYTES = int(os.getenv("MAX_DOCUMENT_BYTES", str(10 * 1024 * 1024)))
+ARCHIVE_DOCUMENT_SUFFIXES = (".pdf", ".docx")
+
+# PDF text extraction: a fast backend first, pdfplumber when it yields too little text
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfium" if pdfium is not None else "pdfminer")
+PDF_MIN_CHARS_PER_PAGE = int(os.getenv("PDF_MIN_CHARS_PER_PAGE", "40"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))  # page-parallel split size
+PDF_TIME_BUDGET = float(os.getenv("PDF_TIME_BUDGET", "10"))  # seconds per document, 0 disables
+
+logger = logging.getLogger(__name__)
+
+
+class UnsupportedDocumentError(ValueError):
+    pass
+
+
+class DocumentTooLargeError(ValueError):
+    pass
+
 
 def clean_text(text: str) -> str:
     # Remove special characters, multiple spaces, and newlines breaking sentences
@@ -8,14 +38,167 @@ def clean_text(text: str) -> str:
     text = re.sub(r'[^\x00-\x7F]+', ' ', text) # Remove non-ASCII
     return text.strip()
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return clean_text(text)
+def _open_source(source):
+    # Paths are passed through; raw bytes are wrapped so nothing touches the disk
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+def _read_bytes(source) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    return source.read()
+
+# ========== PDF BACKENDS ==========
+# Each yields the raw text of pages [start, stop)
+def _pdfium_pages(data: bytes, start: int, stop: int):
+    pdf = pdfium.PdfDocument(data)
+    try:
+        for index in range(start, stop):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            yield textpage.get_text_range()
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+
+def _pdfminer_pages(data: bytes, start: int, stop: int):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LAParams, LTTextContainer
+
+    # Text boxes only; no vertical-text detection or figure analysis
+    laparams = LAParams(line_margin=0.5, char_margin=2.0, detect_vertical=False, all_texts=False)
+    for page in extract_pages(io.BytesIO(data), page_numbers=range(start, stop), laparams=laparams):
+        yield "\n".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+
+def _pdfplumber_pages(data: bytes, start: int, stop: int):
+    # Character-level layout analysis: slowest, highest fidelity
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ""
 
-def extract_text_from_docx(file_path: str) -> str:
-    doc = docx.Document(file_path)
+PDF_BACKENDS = {
+    "pdfium": _pdfium_pages,
+    "pdfminer": _pdfminer_pages,
+    "pdfplumber": _pdfplumber_pages
+}
+
+def available_pdf_backends() -> list:
+    return [name for name in PDF_BACKENDS if name != "pdfium" or pdfium is not None]
+
+def pdf_page_count(data: bytes) -> int:
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+def pdf_page_ranges(data: bytes, pages_per_task: int = PDF_PAGES_PER_TASK) -> list:
+    """Split a PDF into [start, stop) page ranges that can be extracted in parallel"""
+    pages = pdf_page_count(data)
+    return [(start, min(start + pages_per_task, pages)) for start in range(0, pages, pages_per_task)]
+
+def extract_pdf_range(data: bytes, start: int, stop: int, backend: str = None, deadline: float = None) -> str:
+    """
+    Raw text of pages [start, stop) with the fast backend, falling back to
+    pdfplumber when it finds less than PDF_MIN_CHARS_PER_PAGE per page.
+    Pages past the deadline (time.time()) are skipped.
+    """
+    backend = backend or PDF_BACKEND
+    pages = []
+    for page_text in PDF_BACKENDS[backend](data, start, stop):
+        pages.append(page_text)
+        if deadline and time.time() > deadline:
+            logger.warning("PDF time budget exceeded, keeping %d of %d pages", len(pages), stop - start)
+            return "\n".join(pages)
+
+    text = "\n".join(pages)
+    if backend != "pdfplumber" and len(text.strip()) < PDF_MIN_CHARS_PER_PAGE * (stop - start):
+        if not deadline or time.time() < deadline:
+            fallback = "\n".join(_pdfplumber_pages(data, start, stop))
+            if len(fallback.strip()) > len(text.strip()):
+                return fallback
+    return text
+
+def pdf_deadline(time_budget: float = PDF_TIME_BUDGET):
+    return time.time() + time_budget if time_budget else None
+
+def extract_text_from_pdf(source, backend: str = None, time_budget: float = PDF_TIME_BUDGET) -> str:
+    """source: file path, bytes or binary file-like object"""
+    data = _read_bytes(source)
+    deadline = pdf_deadline(time_budget)
+    parts = [extract_pdf_range(data, start, stop, backend, deadline) for start, stop in pdf_page_ranges(data)]
+    return clean_text("\n".join(parts))
+
+def extract_text_from_docx(source) -> str:
+    """source: file path, bytes or binary file-like object"""
+    doc = docx.Document(_open_source(source))
     text = " ".join([para.text for para in doc.paragraphs])
-    return clean_text(text)
\ No newline at end of file
+    return clean_text(text)
+
+def sniff_document_type(data: bytes, filename: str = None, content_type: str = None) -> str:
+    """Detect 'pdf' or 'docx' from the leading bytes, falling back to the declared type"""
+    if b"%PDF-" in data[:1024]:
+        return "pdf"
+    if data[:4] == b"PK\x03\x04":
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            pass
+
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith(".pdf") or content_type == "application/pdf":
+        return "pdf"
+    if name.endswith(".docx") or "wordprocessingml" in content_type:
+        return "docx"
+    raise UnsupportedDocumentError(f"Unsupported document type: {filename or content_type or 'unknown'}")
+
+def extract_text(data: bytes, filename: str = None, content_type: str = None) -> str:
+    """In-memory entry point: size check, type sniffing, then PDF or DOCX extraction"""
+    if len(data) > MAX_DOCUMENT_BYTES:
+        raise DocumentTooLargeError(
+            f"Document is {len(data)} bytes, limit is {MAX_DOCUMENT_BYTES}"
+        )
+
+    if sniff_document_type(data, filename, content_type) == "docx":
+        return extract_text_from_docx(data)
+    return extract_text_from_pdf(data)
+
+def iter_archive_documents(fileobj):
+    """
+    Yields (member name, bytes, error) for every PDF/DOCX in a ZIP archive.
+    Members are decompressed one at a time into memory; nothing is extracted to disk.
+    """
+    with zipfile.ZipFile(fileobj) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            base = os.path.basename(name)
+            if info.is_dir() or name.startswith("__MACOSX/") or base.startswith("."):
+                continue
+            if not base.lower().endswith(ARCHIVE_DOCUMENT_SUFFIXES):
+                continue
+            if info.file_size > MAX_DOCUMENT_BYTES:
+                yield name, None, f"{name} exceeds the {MAX_DOCUMENT_BYTES} byte limit"
+                continue
+
+            # Declared sizes can lie, so cap the decompressed read as well
+            try:
+                with archive.open(info) as member:
+                    data = member.read(MAX_DOCUMENT_BYTES + 1)
+            except (RuntimeError, NotImplementedError, zipfile.BadZipFile) as e:
+                yield name, None, f"{name} could not be read from the archive: {e}"
+                continue
+            if len(data) > MAX_DOCUMENT_BYTES:
+                yield name, None, f"{name} exceeds the {MAX_DOCUMENT_BYTES} byte limit"
+                continue
+            yield name, data, None
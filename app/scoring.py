@@ -1,42 +1,17 @@
 # app/scoring.py
-import re
+from app import metrics
+from app.experience import total_years_of_experience
+from app.sections import section_text
 
+# Overall score = weighted sum of the per-factor scores (see app/ranking.py for re-weighting)
+DEFAULT_WEIGHTS = {"skill": 0.6, "experience": 0.4}
+
+@metrics.timed("experience_years")
 def extract_years_of_experience(text: str) -> float:
-    # Use the same logic as NER model
-    text_lower = text.lower()
-    
-    patterns = [
-        r'(\d+)\+?\s*years?',
-        r'(\d+)\s*yr', 
-        r'experience.*?(\d+)',
-        r'(\d+).*?experience',
-        r'(\d+)\+'
-    ]
-    
-    max_years = 0
-    for pattern in patterns:
-        matches = re.findall(pattern, text_lower, re.IGNORECASE)
-        for match in matches:
-            try:
-                years = int(match)
-                if years > max_years:
-                    max_years = years
-            except:
-                pass
-    
-    # If no explicit years, calculate from dates
-    if max_years == 0:
-        date_pattern = r'(\d{4})\s*[-–]\s*(?:Present|\d{4})'
-        dates = re.findall(date_pattern, text)
-        if dates:
-            try:
-                earliest = min([int(date) for date in dates])
-                max_years = 2026 - earliest
-            except:
-                max_years = 0
-    
-    return float(max_years) if max_years > 0 else 0.0
+    # Same single-pass scanner as the NER model; dated tenure only from the Experience section
+    return total_years_of_experience(text, tenure_text=section_text(text, "experience"))
 
+@metrics.timed("scoring")
 def calculate_scores(skill_match_rate, candidate_exp, required_exp=2.0):
     # Skill Score (0-100)
     skill_score = skill_match_rate * 100
@@ -51,7 +26,7 @@ def calculate_scores(skill_match_rate, candidate_exp, required_exp=2.0):
         exp_score = 100
     
     # Overall Score (weighted)
-    overall_score = (skill_score * 0.6) + (exp_score * 0.4)
+    overall_score = (skill_score * DEFAULT_WEIGHTS["skill"]) + (exp_score * DEFAULT_WEIGHTS["experience"])
     
     return {
         "skill_score": round(skill_score, 1),
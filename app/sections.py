@@ -0,0 +1,129 @@
+"""
+Rule-based resume section segmenter.
+
+One precompiled pattern finds candidate headings ("SKILLS", "Work Experience:",
+"E D U C A T I O N", ...). A match counts as a heading when one of these holds:
+  - it is written in capitals (works on text clean_text flattened to one line)
+  - it is followed by a colon
+  - it stands alone on its line
+Title-case words in running text ("experience with Kafka") are ignored.
+A heading that only has its colon to go on ("Languages: Python, Java") is a
+sub-heading when the open section's heading was in capitals or on its own
+line, so "TECHNICAL SKILLS / Languages: ..." stays one skills section.
+Segmentation only applies when at least MIN_SECTIONS distinct sections are
+found. Otherwise (job descriptions, free text) callers treat the document as
+one block.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+MIN_SECTIONS = 2
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "career summary", "profile", "professional profile",
+                "objective", "career objective", "about me"],
+    "skills": ["skills", "skill", "technical skills", "key skills", "core skills", "core competencies",
+               "competencies", "areas of expertise", "expertise", "technologies", "tech stack"],
+    "experience": ["experience", "work experience", "professional experience", "relevant experience",
+                   "employment history", "employment", "work history", "career history"],
+    "education": ["education", "academic background", "academic qualifications", "education and training"],
+    "certifications": ["certifications", "certification", "certificates", "licenses and certifications",
+                       "licenses & certifications", "licenses", "courses and certifications"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "awards": ["awards", "honors", "honours", "achievements", "awards and honors"],
+    "publications": ["publications"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "hobbies and interests"],
+    "volunteering": ["volunteering", "volunteer experience"],
+    "references": ["references", "referees"],
+}
+
+_HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+
+def _heading_alternative(heading: str) -> str:
+    words = [re.escape(word) for word in heading.split()]
+    alternative = r'\s+'.join(words)
+    if len(words) == 1 and len(heading) > 3:
+        # pdfplumber renders letter-spaced headings as "S K I L L S"
+        alternative += "|" + r' ?'.join(re.escape(char) for char in heading)
+    return alternative
+
+
+# Longest headings first so "work experience" wins over "experience"
+_HEADING_PATTERN = re.compile(
+    r'(?<![\w&])(?P<heading>'
+    + "|".join(_heading_alternative(h) for h in sorted(_HEADING_TO_SECTION, key=len, reverse=True))
+    + r')(?:(?![\w&])|(?=(?-i:[A-Z][a-z])))[ \t]*(?P<colon>:)?',
+    re.IGNORECASE
+)
+
+
+class Section(NamedTuple):
+    name: str
+    start: int  # offset of the section body (after the heading)
+    end: int
+
+
+def _section_name(heading: str) -> Optional[str]:
+    normalized = " ".join(heading.lower().split())
+    if normalized in _HEADING_TO_SECTION:
+        return _HEADING_TO_SECTION[normalized]
+    # Letter-spaced form: "s k i l l s"
+    return _HEADING_TO_SECTION.get(normalized.replace(" ", ""))
+
+
+def _heading_strength(text: str, match) -> int:
+    """2: capitals or alone on its line, 1: only followed by a colon, 0: not a heading"""
+    heading = match.group("heading")
+    letters = [c for c in heading if c.isalpha()]
+    if all(c.isupper() for c in letters):
+        return 2
+    line_start = text.rfind("\n", 0, match.start()) + 1
+    line_end = text.find("\n", match.end())
+    line_end = len(text) if line_end == -1 else line_end
+    if not text[line_start:match.start()].strip(" \t•-*|") and not text[match.end():line_end].strip():
+        return 2
+    return 1 if match.group("colon") else 0
+
+
+@lru_cache(maxsize=128)
+def segment_resume(text: str) -> tuple:
+    """
+    Sections of a resume in document order, as (name, start, end) offsets into text.
+    Empty when fewer than MIN_SECTIONS distinct sections are recognised.
+    """
+    headings = []
+    open_strength = 0
+    for match in _HEADING_PATTERN.finditer(text):
+        name = _section_name(match.group("heading"))
+        strength = _heading_strength(text, match) if name else 0
+        # Colon-only headings under a capitals/own-line heading are sub-headings
+        if strength and strength >= open_strength:
+            headings.append((match, name))
+            open_strength = strength
+    if len({name for _, name in headings}) < MIN_SECTIONS:
+        return ()
+
+    sections = []
+    # Text before the first heading (name, contact details, often an untitled summary)
+    if headings[0][0].start() > 0:
+        sections.append(Section("header", 0, headings[0][0].start()))
+    for i, (match, name) in enumerate(headings):
+        end = headings[i + 1][0].start() if i + 1 < len(headings) else len(text)
+        if text[match.end():end].strip():
+            sections.append(Section(name, match.end(), end))
+    return tuple(sections)
+
+
+def section_text(text: str, name: str) -> Optional[str]:
+    """All sections called name joined together, or None if the resume has none"""
+    parts = [text[s.start:s.end].strip() for s in segment_resume(text) if s.name == name]
+    return "\n".join(parts) if parts else None
+
+
+def split_items(section: str) -> list:
+    """Split a list-like section body (commas, semicolons, bullets, pipes, lines) into items"""
+    items = re.split(r'[\n;|•●▪◦]|,\s+|\s+[-*]\s+', section)
+    return [item.strip(" \t.-*") for item in items if item.strip(" \t.-*")]
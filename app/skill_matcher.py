@@ -1,34 +1,229 @@
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
+import numpy as np
+import threading
 import torch
+from app import metrics
+from app.embedding_store import EMBEDDING_STORE_DIR, SkillEmbeddingStore, normalize_skill
+from app.model_bundle import EMBEDDING_MODEL_NAME, resolve_model
+from app.inference_backend import INFERENCE_BACKEND, load_embedder
+from app.skill_ontology import get_ontology
 
-# Load lightweight embedding model
-embedder = SentenceTransformer('all-MiniLM-L6-v2')
+# Lightweight embedding model, loaded lazily (or by the startup warmup)
+_embedder = None
+_skill_store = None
+_embedder_lock = threading.Lock()
 
-def semantic_match(resume_skills: list, jd_skills: list, threshold=0.5):
+
+def get_embedder():
+    """Load MiniLM once (local bundle when MODEL_DIR provides it, INFERENCE_BACKEND applied)"""
+    global _embedder, _skill_store
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                path, is_local = resolve_model(EMBEDDING_MODEL_NAME)
+                loaded = load_embedder(path, is_local)
+
+                # Persistent skill -> vector store (set EMBEDDING_STORE_DIR="" to disable)
+                if EMBEDDING_STORE_DIR:
+                    # Quantized/ONNX vectors differ slightly from fp32, so keep them apart
+                    store_name = EMBEDDING_MODEL_NAME
+                    if INFERENCE_BACKEND != "torch":
+                        store_name += f"-{INFERENCE_BACKEND}"
+                    _skill_store = SkillEmbeddingStore(
+                        EMBEDDING_STORE_DIR, store_name,
+                        loaded.get_sentence_embedding_dimension()
+                    )
+                _embedder = loaded
+    return _embedder
+
+
+def is_embedder_loaded() -> bool:
+    return _embedder is not None
+
+
+def encode_skills(skills: list):
+    """Embed skill strings, only running the transformer on skills not yet in the store"""
+    embedder = get_embedder()
+    skill_store = _skill_store
+    skills = [normalize_skill(skill) for skill in skills]
+    if skill_store is None:
+        with metrics.span("embedding"):
+            return embedder.encode(skills, convert_to_tensor=True)
+
+    found, missing = skill_store.lookup(skills)
+    metrics.inc("skill_store_hit", len(skills) - len(missing))
+    if missing:
+        metrics.inc("skill_store_miss", len(missing))
+        unique_missing = list(dict.fromkeys(missing))
+        with metrics.span("embedding"):
+            new_vectors = embedder.encode(unique_missing, convert_to_numpy=True)
+        skill_store.add(unique_missing, new_vectors)
+        # Round-trip through float16 so cold and warm requests score identically
+        for skill, vector in zip(unique_missing, new_vectors):
+            found[skill] = vector.astype(np.float16).astype(np.float32)
+
+    return torch.from_numpy(np.stack([found[skill] for skill in skills]))
+
+def encode_skill_lists(skill_lists: list) -> list:
+    """encode_skills for many skill lists in one pass (used by the embedding micro-batcher)"""
+    flat_skills = [skill for skills in skill_lists for skill in skills]
+    if not flat_skills:
+        return [None for _ in skill_lists]
+    flat_embeddings = encode_skills(flat_skills)
+
+    results = []
+    start = 0
+    for skills in skill_lists:
+        results.append(flat_embeddings[start:start + len(skills)] if skills else None)
+        start += len(skills)
+    return results
+
+
+def similarity_matrix(resume_skills: list, jd_skills: list, jd_embeddings=None, resume_embeddings=None) -> np.ndarray:
+    """Raw cosine similarities, rows = resume skills, cols = JD skills"""
     if not resume_skills or not jd_skills:
-        return 0.0, [], list(jd_skills)
+        return np.zeros((len(resume_skills), len(jd_skills)), dtype=np.float32)
+
+    # Encode (embeddings may come precomputed from the JD cache / embedding batcher)
+    if resume_embeddings is None:
+        resume_embeddings = encode_skills(list(resume_skills))
+    if jd_embeddings is None:
+        jd_embeddings = encode_skills(jd_skills)
+
+    return util.cos_sim(resume_embeddings, jd_embeddings).cpu().numpy()
+
 
-    # Encode
-    resume_embeddings = embedder.encode(list(resume_skills), convert_to_tensor=True)
-    jd_embeddings = embedder.encode(jd_skills, convert_to_tensor=True)
-
-    # Compute Cosine Similarity Matrix
-    cosine_scores = util.cos_sim(resume_embeddings, jd_embeddings)
-    
-    matched_skills = set()
-    missing_skills = set(jd_skills)
-    
-    # Analyze matches
-    # Rows = Resume Skills, Cols = JD Skills
-    for i, jd_skill in enumerate(jd_skills):
-        # Find best match in resume for this JD skill
-        best_score = torch.max(cosine_scores[:, i]).item()
-        
-        if best_score >= threshold:
-            matched_skills.add(jd_skill)
-            if jd_skill in missing_skills:
-                missing_skills.remove(jd_skill)
-                
+def match_from_best_scores(best_scores, jd_skills: list, threshold=0.5):
+    """Threshold the best resume score per JD skill; no model work, cheap enough to redo per slider move"""
+    if not jd_skills:
+        return 0.0, [], []
+    matched_skills = list(dict.fromkeys(s for s, score in zip(jd_skills, best_scores) if score >= threshold))
+    missing_skills = list(dict.fromkeys(s for s in jd_skills if s not in matched_skills))
     match_percentage = len(matched_skills) / len(jd_skills)
-    
-    return match_percentage, list(matched_skills), list(missing_skills)
\ No newline at end of file
+
+    return match_percentage, matched_skills, missing_skills
+
+
+def _skill_ids(skills: list) -> list:
+    ontology = get_ontology()
+    return [ontology.skill_id(skill) for skill in skills]
+
+
+def _id_matches(resume_ids: set, jd_ids: list) -> np.ndarray:
+    """JD skills whose canonical id the resume has: an integer-set intersection, no model"""
+    return np.array([skill_id is not None and skill_id in resume_ids for skill_id in jd_ids], dtype=bool)
+
+
+def best_match_scores(resume_skills: list, jd_skills: list, jd_embeddings=None, resume_embeddings=None) -> np.ndarray:
+    """
+    Best resume score per JD skill: 1.0 when the resume has the same canonical
+    skill, otherwise the highest cosine similarity (only these columns are embedded)
+    """
+    # Known skills present on both sides match outright
+    exact = _id_matches(get_ontology().id_set(resume_skills), _skill_ids(jd_skills))
+    best_scores = exact.astype(np.float32)
+    if not resume_skills:
+        return best_scores
+
+    # Only the remaining JD skills go through the similarity matrix (Rows = Resume Skills, Cols = JD Skills)
+    columns = np.flatnonzero(~exact)
+    if len(columns):
+        similarity = similarity_matrix(
+            resume_skills, [jd_skills[c] for c in columns],
+            jd_embeddings=jd_embeddings[columns.tolist()] if jd_embeddings is not None else None,
+            resume_embeddings=resume_embeddings
+        )
+        best_scores[columns] = similarity.max(axis=0)
+    return best_scores
+
+
+@metrics.timed("semantic_match")
+def semantic_match(resume_skills: list, jd_skills: list, threshold=0.5, jd_embeddings=None, resume_embeddings=None):
+    if not resume_skills or not jd_skills:
+        return 0.0, [], list(jd_skills)
+
+    best_scores = best_match_scores(resume_skills, jd_skills, jd_embeddings, resume_embeddings)
+    return match_from_best_scores(best_scores, jd_skills, threshold)
+
+@metrics.timed("semantic_match_batch")
+def semantic_match_batch(resume_skills_list: list, jd_skills: list, threshold=0.5, jd_embeddings=None):
+    """Match many resumes against one JD with a single encode/similarity pass"""
+    if not jd_skills:
+        return [(0.0, [], []) for _ in resume_skills_list]
+
+    # Known skills first: one row of id matches per resume
+    ontology = get_ontology()
+    jd_ids = _skill_ids(jd_skills)
+    exact = np.stack([_id_matches(ontology.id_set(skills or []), jd_ids) for skills in resume_skills_list]) \
+        if resume_skills_list else np.zeros((0, len(jd_skills)), dtype=bool)
+    best_scores = exact.astype(np.float32)
+
+    # JD skills that some resume did not match by id; only those columns are compared
+    columns = np.flatnonzero(~exact.all(axis=0))
+
+    # Flatten the skills of resumes that still need scoring so the embedder sees one batch
+    flat_skills = []
+    offsets = []
+    for r, skills in enumerate(resume_skills_list):
+        if skills and (~exact[r]).any():
+            offsets.append((r, len(flat_skills), len(flat_skills) + len(skills)))
+            flat_skills.extend(skills)
+
+    if flat_skills and len(columns):
+        # Encode
+        resume_embeddings = encode_skills(flat_skills)
+        if jd_embeddings is None:
+            jd_embeddings = encode_skills([jd_skills[c] for c in columns])
+        else:
+            jd_embeddings = jd_embeddings[columns.tolist()]
+
+        # Rows = all resume skills, Cols = remaining JD skills
+        cosine_scores = util.cos_sim(resume_embeddings, jd_embeddings).cpu().numpy()
+        for r, start, end in offsets:
+            best_scores[r, columns] = np.maximum(best_scores[r, columns], cosine_scores[start:end].max(axis=0))
+
+    return [
+        match_from_best_scores(scores, jd_skills, threshold) if skills else (0.0, [], list(jd_skills))
+        for skills, scores in zip(resume_skills_list, best_scores)
+    ]
+
+
+@metrics.timed("semantic_match_multi")
+def semantic_match_multi(resume_skills: list, jd_skills_list: list, threshold=0.5, jd_embeddings_list=None):
+    """Match one resume against many JDs: one resume encode, one matmul, one column-max reduction"""
+    if not resume_skills:
+        return [(0.0, [], list(jd_skills)) for jd_skills in jd_skills_list]
+
+    # Known skills first: JD skills whose canonical id the resume has need no model work
+    resume_ids = get_ontology().id_set(resume_skills)
+    best_scores_list = []
+    pending = []  # (JD index, columns still to score)
+    jd_vectors = []
+    for i, jd_skills in enumerate(jd_skills_list):
+        exact = _id_matches(resume_ids, _skill_ids(jd_skills))
+        best_scores_list.append(exact.astype(np.float32))
+        columns = np.flatnonzero(~exact)
+        if not len(columns):
+            continue
+        if jd_embeddings_list is not None and jd_embeddings_list[i] is not None:
+            jd_vectors.append(jd_embeddings_list[i].cpu().numpy()[columns])
+        else:
+            jd_vectors.append(encode_skills([jd_skills[c] for c in columns]).cpu().numpy())
+        pending.append((i, columns))
+
+    # Stack the remaining columns of every JD into one matrix
+    if jd_vectors:
+        resume_embeddings = encode_skills(list(resume_skills))
+        jd_matrix = torch.from_numpy(np.concatenate(jd_vectors))
+
+        # Rows = resume skills, Cols = remaining JD skills; best resume match per JD skill in one reduction
+        best_scores = util.cos_sim(resume_embeddings, jd_matrix).cpu().numpy().max(axis=0)
+        start = 0
+        for i, columns in pending:
+            best_scores_list[i][columns] = best_scores[start:start + len(columns)]
+            start += len(columns)
+
+    return [
+        match_from_best_scores(scores, jd_skills, threshold) if jd_skills else (0.0, [], [])
+        for jd_skills, scores in zip(jd_skills_list, best_scores_list)
+    ]
@@ -0,0 +1,96 @@
+"""
+Canonical skill ontology built from the skills taxonomy (app/data/skills_taxonomy.txt).
+
+Every canonical skill gets an integer id. canonicalize() maps free-form
+skill strings onto these ids in two steps:
+  1. exact lookup of the canonical name or any alias ("ms excel" -> microsoft excel)
+  2. nearest neighbour in a precomputed matrix of canonical-name embeddings,
+     accepted above ONTOLOGY_NN_THRESHOLD ("excel spreadsheets" -> microsoft excel)
+Strings that match neither stay free-form. Only these unknown strings are
+embedded at match time; known skills compare as integer ids.
+"""
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+from app.embedding_store import normalize_skill
+from app.gazetteer import SKILLS_TAXONOMY, load_taxonomy
+
+# High on purpose: merging "react" into "react native" is worse than missing a synonym
+ONTOLOGY_NN_THRESHOLD = float(os.getenv("ONTOLOGY_NN_THRESHOLD", "0.9"))
+
+
+class SkillOntology:
+    def __init__(self, surface_forms: dict):
+        """surface_forms: {alias or canonical name: canonical name}, as from load_taxonomy"""
+        self.names = sorted(set(surface_forms.values()))
+        ids = {name: skill_id for skill_id, name in enumerate(self.names)}
+        self._ids = {normalize_skill(form): ids[canonical] for form, canonical in surface_forms.items()}
+        self._matrix = None
+        self._matrix_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str):
+        return cls(load_taxonomy(path))
+
+    def __len__(self):
+        return len(self.names)
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        """Exact/alias lookup only (no model)"""
+        return self._ids.get(normalize_skill(skill))
+
+    def id_set(self, skills: list) -> set:
+        return {skill_id for skill_id in map(self.skill_id, skills) if skill_id is not None}
+
+    def matrix(self) -> np.ndarray:
+        """L2-normalised embeddings of the canonical names, row i <-> id i (computed once)"""
+        if self._matrix is None:
+            with self._matrix_lock:
+                if self._matrix is None:
+                    from app.skill_matcher import encode_skills
+                    vectors = np.asarray(encode_skills(self.names).cpu().numpy(), dtype=np.float32)
+                    self._matrix = vectors / np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+        return self._matrix
+
+    def canonicalize(self, skills: list, nn_threshold: float = ONTOLOGY_NN_THRESHOLD) -> list:
+        """Canonical id (or None for unknown skills) per skill"""
+        ids = [self.skill_id(skill) for skill in skills]
+        unknown = [i for i, skill_id in enumerate(ids) if skill_id is None]
+        if not unknown or nn_threshold >= 1 or not self.names:
+            return ids
+
+        from app.skill_matcher import encode_skills
+        vectors = np.asarray(encode_skills([skills[i] for i in unknown]).cpu().numpy(), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+        similarity = vectors @ self.matrix().T
+        nearest = similarity.argmax(axis=1)
+        for row, i in enumerate(unknown):
+            if similarity[row, nearest[row]] >= nn_threshold:
+                ids[i] = int(nearest[row])
+        return ids
+
+    def canonical_names(self, skills: list, nn_threshold: float = ONTOLOGY_NN_THRESHOLD) -> list:
+        """Skills with known ones replaced by their canonical name, duplicates removed, order kept"""
+        ids = self.canonicalize(skills, nn_threshold)
+        names = (
+            self.names[skill_id] if skill_id is not None else normalize_skill(skill)
+            for skill, skill_id in zip(skills, ids)
+        )
+        return list(dict.fromkeys(names))
+
+
+_ontology = None
+_ontology_lock = threading.Lock()
+
+
+def get_ontology() -> SkillOntology:
+    """Build the configured taxonomy's ontology once per process"""
+    global _ontology
+    if _ontology is None:
+        with _ontology_lock:
+            if _ontology is None:
+                _ontology = SkillOntology.from_file(SKILLS_TAXONOMY)
+    return _ontology
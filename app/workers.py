@@ -0,0 +1,140 @@
+"""
+Executors that keep CPU-bound work off the asyncio event loop.
+
+- PDF parsing runs in a process pool (pdfplumber is pure Python and holds the GIL)
+- GLiNER / MiniLM run in a thread pool (torch releases the GIL), with the
+  torch intra-op thread count pinned so workers don't oversubscribe the CPU
+- At most MAX_PENDING_REQUESTS requests are admitted at once; beyond that
+  we answer 429 immediately instead of queueing without bound
+- Every admitted request has a deadline; exceeding it returns 503
+- A parse process that dies (segfault, OOM kill) breaks the process pool; it is
+  replaced and the parse retried once, then 503
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+TORCH_THREADS = int(os.getenv("TORCH_THREADS", str(max(1, (os.cpu_count() or 1) // INFERENCE_WORKERS))))
+MAX_PENDING_REQUESTS = int(os.getenv("MAX_PENDING_REQUESTS", "32"))
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "60"))  # seconds
+# Extra deadline per document for multi-document requests (/match/batch)
+DOCUMENT_TIMEOUT = float(os.getenv("DOCUMENT_TIMEOUT", "5"))  # seconds
+
+_pdf_pool = None
+_inference_pool = None
+_pending = 0
+
+logger = logging.getLogger(__name__)
+
+
+def _init_inference_thread():
+    import torch
+    torch.set_num_threads(TORCH_THREADS)
+
+
+def get_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is None:
+        # spawn: never fork a process that already has torch threads running
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pdf_pool
+
+
+def get_inference_pool():
+    global _inference_pool
+    if _inference_pool is None:
+        _inference_pool = ThreadPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            thread_name_prefix="inference",
+            initializer=_init_inference_thread
+        )
+    return _inference_pool
+
+
+def _discard_pdf_pool(pool):
+    # Concurrent parses all see the same broken pool; only the first one replaces it
+    global _pdf_pool
+    if _pdf_pool is pool:
+        _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_parse(fn, *args):
+    """Run a document-parsing function in the process pool, on a fresh pool if a worker died"""
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = get_pdf_pool()
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            logger.warning("PDF parse process died, replacing the pool (attempt %d)", attempt + 1)
+            _discard_pdf_pool(pool)
+    raise HTTPException(status_code=503, detail="Document parser crashed, retry later")
+
+
+async def run_inference(fn, *args):
+    """Run a model-bound function in the inference thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_inference_pool(), fn, *args)
+
+
+def check_capacity():
+    """Fail fast with 429 when the service is saturated (reserves nothing)"""
+    if _pending >= MAX_PENDING_REQUESTS:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests in flight, retry later",
+            headers={"Retry-After": "1"}
+        )
+
+
+@asynccontextmanager
+async def admit():
+    """Reserve a request slot or fail fast with 429 when the service is saturated"""
+    global _pending
+    check_capacity()
+    _pending += 1
+    try:
+        yield
+    finally:
+        _pending -= 1
+
+
+async def with_deadline(coro, timeout: float = REQUEST_TIMEOUT):
+    """
+    Await coro with a per-request deadline (503 on expiry).
+    Work already running in an executor still finishes, but its result is dropped.
+    """
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail=f"Request exceeded the {timeout:.0f}s deadline")
+
+
+def batch_timeout(documents: int) -> float:
+    """Deadline for a request carrying several documents: the base deadline plus DOCUMENT_TIMEOUT each"""
+    return REQUEST_TIMEOUT + DOCUMENT_TIMEOUT * max(0, documents - 1)
+
+
+def pending_requests() -> int:
+    return _pending
+
+
+def shutdown():
+    global _pdf_pool, _inference_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+    if _inference_pool is not None:
+        _inference_pool.shutdown(wait=False, cancel_futures=True)
+        _inference_pool = None
@@ -1,12 +1,10 @@
 import streamlit as st
-import tempfile
-import os
-import shutil
-from app.resume_parser import extract_text_from_pdf
-from app.ner_model import extract_entities
-from app.skill_matcher import semantic_match
+from app.resume_parser import extract_text
+from app.ner_model import extract_entities, get_model
+from app.skill_matcher import get_embedder, best_match_scores, match_from_best_scores
 from app.scoring import extract_years_of_experience, calculate_scores
 from app.explainer import generate_explanation
+from app.profile_store import ProfileStore, profile_id_for
 
 # Page configuration
 st.set_page_config(
@@ -51,6 +49,46 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ========== CACHED PIPELINE STAGES ==========
+# Models and the expensive per-upload work are cached; moving a slider only
+# re-runs thresholding, calculate_scores and generate_explanation.
+@st.cache_resource(show_spinner="Loading models...")
+def load_models():
+    # Shared by every session in this process
+    return get_model(), get_embedder()
+
+
+@st.cache_resource
+def get_profile_store():
+    return ProfileStore()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def analyze_resume(data: bytes, filename: str, content_type: str):
+    # Keyed by the upload bytes; the profile store also survives app restarts
+    profile_store = get_profile_store()
+    profile_id = profile_id_for(data)
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        resume_text = extract_text(data, filename, content_type)
+        resume_data = extract_entities(resume_text, segment=True)
+        candidate_exp = extract_years_of_experience(resume_text)
+        profile_store.put(profile_id, filename, resume_text, resume_data, candidate_exp)
+        return resume_data["skills"], candidate_exp
+    return profile["entities"]["skills"], profile["experience_years"]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def analyze_jd(jd_text: str):
+    return list(extract_entities(jd_text)["skills"])
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def skill_match_scores(resume_skills: tuple, jd_skills: tuple):
+    # Best resume score per JD skill (canonical id match or cosine), independent of the threshold
+    return best_match_scores(list(resume_skills), list(jd_skills))
+
+
 # Title and header
 st.markdown('<h1 class="main-header">📄 Intelligent Resume Matcher</h1>', unsafe_allow_html=True)
 st.markdown("""
@@ -66,9 +104,9 @@ with st.sidebar:
     # File upload section
     st.subheader("1. Upload Resume")
     uploaded_file = st.file_uploader(
-        "Choose a PDF file",
-        type=["pdf"],
-        help="Upload the candidate's resume in PDF format"
+        "Choose a PDF or DOCX file",
+        type=["pdf", "docx"],
+        help="Upload the candidate's resume in PDF or DOCX format"
     )
     
     if uploaded_file:
@@ -123,28 +161,29 @@ with st.sidebar:
         disabled=(not uploaded_file or not jd_text)
     )
 
+# Once analyzed, results stay on screen and follow the sliders until the resume or JD changes
+inputs_key = (uploaded_file.name, uploaded_file.size, jd_text) if uploaded_file and jd_text else None
+if analyze_btn and inputs_key:
+    st.session_state["analyzed_inputs"] = inputs_key
+
 # Main content area
-if analyze_btn and uploaded_file and jd_text:
+if inputs_key and st.session_state.get("analyzed_inputs") == inputs_key:
     with st.spinner("🔍 Analyzing resume and job description..."):
-        # Save uploaded file temporarily (same as FastAPI)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
         try:
-            # 1. Save and Parse Resume (same as FastAPI)
-            resume_text = extract_text_from_pdf(tmp_path)
+            load_models()
             
-            # 2. Extract Entities (Resume) - same as FastAPI
-            resume_data = extract_entities(resume_text)
-            candidate_exp = extract_years_of_experience(resume_text)
+            # 1-2. Parse Resume + Extract Entities (cached per upload)
+            resume_skills, candidate_exp = analyze_resume(
+                uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type
+            )
+            resume_data = {"skills": resume_skills}
             
-            # 3. Extract Entities (JD) - same as FastAPI
-            jd_data = extract_entities(jd_text)
-            jd_skills = list(jd_data["skills"])
+            # 3. Extract Entities (JD) - cached per JD text
+            jd_skills = analyze_jd(jd_text)
             
-            # 4. Semantic Matching - same as FastAPI
-            match_rate, matched, missing = semantic_match(resume_data["skills"], jd_skills, threshold=match_threshold)
+            # 4. Semantic Matching - scores cached, only thresholding re-runs
+            best_scores = skill_match_scores(tuple(resume_skills), tuple(jd_skills))
+            match_rate, matched, missing = match_from_best_scores(best_scores, jd_skills, threshold=match_threshold)
             
             # 5. Scoring - same as FastAPI
             scores = calculate_scores(match_rate, candidate_exp, required_exp)
@@ -288,14 +327,8 @@ if analyze_btn and uploaded_file and jd_text:
         except Exception as e:
             st.error(f"❌ Error processing resume: {str(e)}")
             st.exception(e)
-        finally:
-            # Cleanup temp file (same as FastAPI)
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
 
-elif not uploaded_file or not jd_text:
+elif not inputs_key:
     # Show empty state with instructions
     st.markdown("---")
     
@@ -304,7 +337,7 @@ elif not uploaded_file or not jd_text:
     with col1:
         st.info("👈 **Get Started**")
         st.markdown("""
-        1. **Upload a resume** (PDF format) in the sidebar
+        1. **Upload a resume** (PDF or DOCX format) in the sidebar
         2. **Paste the job description** you want to match against
         3. **Set experience requirements** using the slider
         4. Click **'Analyze Resume Match'** to see results
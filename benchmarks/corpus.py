@@ -0,0 +1,178 @@
+"""
+Deterministic synthetic corpus of resumes (PDF + DOCX) and job descriptions.
+
+    python -m benchmarks.corpus --out benchmarks/corpus --resumes 40 --jds 5
+
+Resumes come in short (1 page), medium (2-3 pages) and long (6-10 pages)
+sizes so per-stage timings can be read against document length. Only
+python-docx is needed; PDFs are written directly with a minimal writer.
+"""
+import argparse
+import io
+import json
+import os
+import random
+
+import docx
+
+from app.gazetteer import DEFAULT_TAXONOMY_PATH, load_taxonomy
+
+SIZES = {
+    "short": (1, 1),
+    "medium": (2, 3),
+    "long": (6, 10)
+}
+LINES_PER_PAGE = 48
+CHARS_PER_LINE = 90
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Novak", "Patel", "Silva", "Kowalski", "Haddad", "Ito"]
+ROLES = ["Software Engineer", "Data Analyst", "Registered Nurse", "Administrative Assistant",
+         "Project Manager", "DevOps Engineer", "Accountant", "Product Designer"]
+COMPANIES = ["Redford & Sons", "Northwind Health", "Acme Analytics", "Blue Harbor Systems",
+             "Granite Logistics", "Summit Financial", "Helix Labs", "Cedar Valley Clinic"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+FILLER = [
+    "Delivered measurable improvements across {n} concurrent initiatives.",
+    "Collaborated with cross-functional partners to streamline weekly reporting.",
+    "Reduced turnaround time by {n}% through process redesign and automation.",
+    "Coordinated with {n} stakeholders to prioritise the quarterly roadmap.",
+    "Maintained documentation and trained {n} new team members.",
+    "Table: Q1 {n} Q2 {m} Q3 {n} Q4 {m} total {n}{m} units, variance {m}.{n}%."
+]
+
+
+def _skill_vocabulary():
+    return sorted(set(load_taxonomy(DEFAULT_TAXONOMY_PATH).values()))
+
+
+def _wrap(text: str, width: int = CHARS_PER_LINE):
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+    return lines
+
+
+def resume_lines(rng: random.Random, pages: int, skills: list):
+    """Header, skills, dated experience blocks and filler up to `pages` pages"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    own_skills = rng.sample(skills, min(len(skills), rng.randint(8, 25)))
+    lines = [name.upper(), rng.choice(ROLES), "", "SKILLS"]
+    lines += _wrap(", ".join(s.title() for s in own_skills))
+    lines += ["", "EXPERIENCE"]
+
+    year = 2025
+    while len(lines) < pages * LINES_PER_PAGE - 6:
+        start_year = year - rng.randint(1, 4)
+        end = "Present" if year == 2025 else f"{rng.choice(MONTHS)} {year}"
+        lines += ["", f"{rng.choice(ROLES).upper()}",
+                  f"{rng.choice(COMPANIES)} / {rng.choice(MONTHS)} {start_year} - {end}"]
+        for _ in range(rng.randint(4, 12)):
+            sentence = rng.choice(FILLER).format(n=rng.randint(2, 60), m=rng.randint(100, 9999))
+            if rng.random() < 0.5:
+                sentence += f" Used {rng.choice(own_skills)} daily."
+            lines += _wrap(f"- {sentence}")
+        year = start_year
+
+    lines += ["", "EDUCATION", f"B.Sc., State University, {year - 4}",
+              "", "CERTIFICATIONS", rng.choice(["PMP", "AWS Certified Developer", "BLS, ACLS", "CPA"])]
+    return lines[:pages * LINES_PER_PAGE]
+
+
+def jd_text(rng: random.Random, skills: list, n_skills: int):
+    role = rng.choice(ROLES)
+    required = rng.sample(skills, min(len(skills), n_skills))
+    bullets = "\n".join(f"- {s.title()}" for s in required)
+    return (f"Looking for a {role} with {rng.randint(1, 8)}+ years experience.\n"
+            f"Required skills:\n{bullets}\n"
+            f"Responsibilities include reporting, collaboration and stakeholder communication.")
+
+
+def _pdf_escape(line: str) -> str:
+    return line.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(lines: list) -> bytes:
+    """Minimal multi-page PDF with one Helvetica text stream per page"""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 50 760 Td 15 TL " + " ".join(f"({_pdf_escape(l)}) '" for l in page) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Contents {len(objects)} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    out.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode())
+    out.write(f"trailer << /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def write_docx(lines: list) -> bytes:
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def generate_corpus(out_dir: str, n_resumes: int = 30, n_jds: int = 5, seed: int = 13):
+    """Write resumes/*.pdf|docx, jds/*.txt and manifest.json; returns the manifest"""
+    rng = random.Random(seed)
+    skills = _skill_vocabulary()
+    os.makedirs(os.path.join(out_dir, "resumes"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "jds"), exist_ok=True)
+
+    manifest = {"seed": seed, "resumes": [], "jds": []}
+    size_names = list(SIZES)
+    for i in range(n_resumes):
+        size = size_names[i % len(size_names)]
+        pages = rng.randint(*SIZES[size])
+        lines = resume_lines(rng, pages, skills)
+        # Every fourth resume is DOCX so both parsers are exercised
+        fmt = "docx" if i % 4 == 3 else "pdf"
+        name = f"resume_{i:04d}_{size}.{fmt}"
+        data = write_pdf(lines) if fmt == "pdf" else write_docx(lines)
+        with open(os.path.join(out_dir, "resumes", name), "wb") as f:
+            f.write(data)
+        manifest["resumes"].append({"file": name, "size": size, "pages": pages, "format": fmt, "bytes": len(data)})
+
+    for i in range(n_jds):
+        n_skills = [5, 10, 20, 40][i % 4]
+        name = f"jd_{i:02d}_{n_skills}skills.txt"
+        with open(os.path.join(out_dir, "jds", name), "w", encoding="utf-8") as f:
+            f.write(jd_text(rng, skills, n_skills))
+        manifest["jds"].append({"file": name, "skills": n_skills})
+
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.corpus")
+    parser.add_argument("--out", default=os.path.join("benchmarks", "corpus"))
+    parser.add_argument("--resumes", type=int, default=30)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+    manifest = generate_corpus(args.out, args.resumes, args.jds, args.seed)
+    print(f"Wrote {len(manifest['resumes'])} resumes and {len(manifest['jds'])} JDs to {args.out}")
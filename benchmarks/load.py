@@ -0,0 +1,282 @@
+"""
+HTTP load test of POST /match with latency SLO reporting.
+
+    python -m benchmarks.load --stub --concurrency 16 --duration 30            # in-process (httpx ASGI)
+    python -m benchmarks.load --stub --spawn --concurrency 32 --slo-p99-ms 800 # local uvicorn subprocess
+    python -m benchmarks.load --url http://127.0.0.1:8000 --mix short:1,long:1 --unique-jd-ratio 0.2
+
+`concurrency` clients send requests back to back for `duration` seconds.
+Each request draws a short or long resume by the --mix weights. It uses one
+of a few fixed JDs (JD cache hits) or a unique JD (cache misses), by
+--unique-jd-ratio. Resume bytes are made unique per request unless
+--repeat-resumes is set, so the profile store does not skip parsing.
+
+The report gives:
+  - throughput and latency percentiles of successful requests
+  - the error rate (5xx and transport errors) and the 429 rate (admission control)
+  - a per-interval timeline of completions, p99 and server RSS/PSS, sampled from GET /memory
+
+With --slo-p99-ms the exit code is 1 when p99 misses the target.
+
+--stub sets INFERENCE_BACKEND=stub for the in-process app or the spawned
+server, so GLiNER and MiniLM are replaced by deterministic stand-ins and the
+numbers show the web/parsing layers' own overhead. Against --url, start the
+server with INFERENCE_BACKEND=stub yourself.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.corpus import SIZES, _skill_vocabulary, jd_text, resume_lines, write_pdf
+from benchmarks.run import percentile
+
+FIXED_JDS = 4
+RESUME_POOL = 8  # distinct documents per resume size
+
+
+def parse_mix(mix: str) -> dict:
+    """"short:3,long:1" -> {"short": 3.0, "long": 1.0}"""
+    weights = {}
+    for part in mix.split(","):
+        size, _, weight = part.partition(":")
+        size = size.strip()
+        if size not in SIZES:
+            raise ValueError(f"Unknown resume size {size!r} (expected one of {list(SIZES)})")
+        weights[size] = float(weight or 1)
+    return weights
+
+
+class RequestMix:
+    """Pre-generated resumes per size and a few fixed JDs; next() draws one request"""
+
+    def __init__(self, weights: dict, unique_jd_ratio: float, repeat_resumes: bool, seed: int = 13):
+        self.rng = random.Random(seed)
+        skills = _skill_vocabulary()
+        self.sizes = list(weights)
+        self.weights = [weights[size] for size in self.sizes]
+        self.resumes = {
+            size: [write_pdf(resume_lines(self.rng, self.rng.randint(*SIZES[size]), skills)) for _ in range(RESUME_POOL)]
+            for size in self.sizes
+        }
+        self.jds = [jd_text(self.rng, skills, n_skills) for n_skills in (5, 10, 20, 40)[:FIXED_JDS]]
+        self.unique_jd_ratio = unique_jd_ratio
+        self.repeat_resumes = repeat_resumes
+        self._counter = 0
+
+    def next(self):
+        self._counter += 1
+        size = self.rng.choices(self.sizes, self.weights)[0]
+        data = self.rng.choice(self.resumes[size])
+        if not self.repeat_resumes:
+            # A comment after %%EOF changes the content address, not the text
+            data += f"%load-{self._counter}\n".encode()
+        jd = self.rng.choice(self.jds)
+        if self.rng.random() < self.unique_jd_ratio:
+            jd += f"\nRequisition {self._counter}."
+        return size, {"file": (f"resume_{self._counter}.pdf", data, "application/pdf")}, {"jd_text": jd, "required_exp": "3"}
+
+
+async def _client_loop(client: httpx.AsyncClient, mix: RequestMix, stop_at: float, started: float, results: list):
+    while time.perf_counter() < stop_at:
+        size, files, data = mix.next()
+        start = time.perf_counter()
+        try:
+            response = await client.post("/match", files=files, data=data)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None  # transport error / timeout
+        results.append((start - started, time.perf_counter() - start, status, size))
+
+
+async def _memory_sampler(client: httpx.AsyncClient, interval: float, stop_at: float, started: float, samples: list):
+    while time.perf_counter() < stop_at:
+        try:
+            report = (await client.get("/memory")).json()
+            samples.append((time.perf_counter() - started, report["total_rss_mb"], report["total_pss_mb"]))
+        except (httpx.HTTPError, ValueError, KeyError):
+            pass
+        await asyncio.sleep(interval)
+
+
+def _latency_ms(latencies: list) -> dict:
+    values = sorted(latencies)
+    return {
+        "mean": round(1000 * sum(values) / len(values), 2) if values else None,
+        "p50": round(1000 * percentile(values, 0.50), 2),
+        "p90": round(1000 * percentile(values, 0.90), 2),
+        "p95": round(1000 * percentile(values, 0.95), 2),
+        "p99": round(1000 * percentile(values, 0.99), 2),
+        "max": round(1000 * values[-1], 2) if values else None
+    }
+
+
+def build_report(results: list, memory_samples: list, elapsed: float, interval: float) -> dict:
+    total = len(results)
+    ok = [latency for _, latency, status, _ in results if status == 200]
+    errors = sum(1 for _, _, status, _ in results if status is None or status >= 500)
+    rejected = sum(1 for _, _, status, _ in results if status == 429)
+    status_counts = {}
+    for _, _, status, _ in results:
+        key = str(status) if status is not None else "transport_error"
+        status_counts[key] = status_counts.get(key, 0) + 1
+
+    timeline = []
+    for i in range(int(elapsed // interval) + 1):
+        window = [r for r in results if i * interval <= r[0] + r[1] < (i + 1) * interval]
+        memory = [m for m in memory_samples if i * interval <= m[0] < (i + 1) * interval]
+        timeline.append({
+            "t_s": round(i * interval, 2),
+            "completed": len(window),
+            "p99_ms": _latency_ms([r[1] for r in window if r[2] == 200])["p99"],
+            "rejected_429": sum(1 for r in window if r[2] == 429),
+            "rss_mb": memory[-1][1] if memory else None,
+            "pss_mb": memory[-1][2] if memory else None
+        })
+
+    return {
+        "requests": total,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_per_s": round(len(ok) / elapsed, 2) if elapsed else None,
+        "latency_ms": _latency_ms(ok),
+        "latency_ms_by_size": {
+            size: _latency_ms([latency for _, latency, status, s in results if status == 200 and s == size])
+            for size in sorted({r[3] for r in results})
+        },
+        "status_counts": status_counts,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "rate_429": round(rejected / total, 4) if total else 0.0,
+        "rss_mb": {
+            "start": memory_samples[0][1] if memory_samples else None,
+            "peak": max(m[1] for m in memory_samples) if memory_samples else None,
+            "end": memory_samples[-1][1] if memory_samples else None
+        },
+        "timeline": timeline
+    }
+
+
+async def run_load(client: httpx.AsyncClient, mix: RequestMix, concurrency: int, duration: float, interval: float) -> dict:
+    results, memory_samples = [], []
+    started = time.perf_counter()
+    stop_at = started + duration
+    await asyncio.gather(
+        _memory_sampler(client, interval, stop_at, started, memory_samples),
+        *(_client_loop(client, mix, stop_at, started, results) for _ in range(concurrency))
+    )
+    return build_report(results, memory_samples, time.perf_counter() - started, interval)
+
+
+@contextlib.contextmanager
+def spawned_server(port: int, ready_timeout: float = 300):
+    """uvicorn app.main:app in a subprocess, yielded once GET /ready says the models are loaded"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        env=os.environ.copy()
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.perf_counter() + ready_timeout
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                if httpx.get(f"{url}/ready", timeout=2).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Server not ready after {ready_timeout}s")
+            time.sleep(0.5)
+        yield url
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+async def _run_in_process(args, mix: RequestMix) -> dict:
+    # Imported here so --stub is in the environment before the models are chosen
+    from app.main import app
+    from app.model_bundle import warmup
+    from app import workers
+
+    warmup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=args.timeout) as client:
+            return await run_load(client, mix, args.concurrency, args.duration, args.sample_interval)
+    finally:
+        workers.shutdown()
+
+
+async def _run_remote(args, url: str, mix: RequestMix) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        return await run_load(client, mix, args.concurrency, args.duration, args.sample_interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="running server to test (default: the app in-process)")
+    target.add_argument("--spawn", action="store_true", help="start a local uvicorn server and test it")
+    parser.add_argument("--port", type=int, default=8765, help="port for --spawn")
+    parser.add_argument("--stub", action="store_true", help="INFERENCE_BACKEND=stub (in-process / --spawn)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="seconds")
+    parser.add_argument("--mix", default="short:3,long:1", help="resume sizes and weights, e.g. short:3,medium:1,long:1")
+    parser.add_argument("--unique-jd-ratio", type=float, default=0.5, help="share of requests with an uncached JD")
+    parser.add_argument("--repeat-resumes", action="store_true", help="reuse identical resume bytes (profile store hits)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="timeline / RSS sampling interval (s)")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout (s)")
+    parser.add_argument("--slo-p99-ms", type=float, help="exit 1 if p99 of successful requests exceeds this")
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    args = parser.parse_args(argv)
+
+    if args.stub:
+        os.environ["INFERENCE_BACKEND"] = "stub"
+    mix = RequestMix(parse_mix(args.mix), args.unique_jd_ratio, args.repeat_resumes)
+
+    # Keep stdout clean for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.url:
+            report = asyncio.run(_run_remote(args, args.url, mix))
+        elif args.spawn:
+            with spawned_server(args.port) as url:
+                report = asyncio.run(_run_remote(args, url, mix))
+        else:
+            report = asyncio.run(_run_in_process(args, mix))
+
+    report["meta"] = {
+        "target": args.url or ("spawn" if args.spawn else "in-process"),
+        "inference_backend": os.getenv("INFERENCE_BACKEND", "torch") if not args.url else None,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "mix": parse_mix(args.mix),
+        "unique_jd_ratio": args.unique_jd_ratio,
+        "repeat_resumes": args.repeat_resumes
+    }
+
+    exit_code = 0
+    if args.slo_p99_ms is not None:
+        p99 = report["latency_ms"]["p99"]
+        met = bool(report["latency_ms"]["mean"] is not None and p99 <= args.slo_p99_ms)
+        report["slo"] = {"p99_ms": args.slo_p99_ms, "met": met}
+        exit_code = 0 if met else 1
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Per-stage benchmark of the matching pipeline on a synthetic corpus.
+
+    python -m benchmarks.run                               # generate corpus if needed, print JSON
+    python -m benchmarks.run --output results.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.15
+
+Stages are timed separately (document parsing, extract_entities,
+extract_years_of_experience, semantic_match, calculate_scores) and end to
+end. Each reports count, throughput, mean and p50/p95/p99 in milliseconds.
+Peak RSS comes from getrusage. With --baseline, any stage whose p50 or p95
+is slower than the baseline by more than the tolerance is flagged, and the
+exit code is 1.
+
+Runs offline (HF_HUB_OFFLINE=1) against locally cached models or MODEL_DIR.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+DEFAULT_CORPUS_DIR = os.path.join("benchmarks", "corpus")
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(samples: list) -> dict:
+    """samples are seconds; reported in milliseconds"""
+    values = sorted(samples)
+    total = sum(values)
+    return {
+        "count": len(values),
+        "throughput_per_s": round(len(values) / total, 3) if total else None,
+        "mean_ms": round(1000 * total / len(values), 3) if values else None,
+        "p50_ms": round(1000 * percentile(values, 0.50), 3),
+        "p95_ms": round(1000 * percentile(values, 0.95), 3),
+        "p99_ms": round(1000 * percentile(values, 0.99), 3)
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+
+    def time(self, stage: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.samples.setdefault(stage, []).append(time.perf_counter() - start)
+        return result
+
+    def report(self) -> dict:
+        return {stage: summarize(values) for stage, values in self.samples.items()}
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def load_corpus(corpus_dir: str):
+    with open(os.path.join(corpus_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    resumes = []
+    for entry in manifest["resumes"]:
+        with open(os.path.join(corpus_dir, "resumes", entry["file"]), "rb") as f:
+            resumes.append((entry, f.read()))
+    jds = []
+    for entry in manifest["jds"]:
+        with open(os.path.join(corpus_dir, "jds", entry["file"]), encoding="utf-8") as f:
+            jds.append((entry, f.read()))
+    return resumes, jds
+
+
+def run_benchmark(corpus_dir: str, repeat: int = 1, warmup: int = 2) -> dict:
+    from app.resume_parser import (
+        PDF_BACKEND, available_pdf_backends, extract_text_from_docx, extract_text_from_pdf
+    )
+    from app.ner_model import extract_entities, get_model
+    from app.skill_matcher import get_embedder, semantic_match
+    from app.scoring import calculate_scores, extract_years_of_experience
+    from app.explainer import generate_explanation
+
+    resumes, jds = load_corpus(corpus_dir)
+
+    load_start = time.perf_counter()
+    get_model()
+    get_embedder()
+    model_load_s = time.perf_counter() - load_start
+
+    # JD skills are extracted once up front; the JD cache is not what we measure here
+    jd_skills = [list(extract_entities(text)["skills"]) for _, text in jds]
+
+    # Warm up kernels/allocators on a few documents, untimed
+    for entry, data in resumes[:warmup]:
+        text = extract_text_from_docx(data) if entry["format"] == "docx" else extract_text_from_pdf(data)
+        semantic_match(extract_entities(text)["skills"], jd_skills[0])
+
+    timer = StageTimer()
+    by_size = StageTimer()
+    wall_start = time.perf_counter()
+    for _ in range(repeat):
+        for i, (entry, data) in enumerate(resumes):
+            doc_start = time.perf_counter()
+            skills = jd_skills[i % len(jd_skills)]
+
+            parse_stage = "extract_text_from_docx" if entry["format"] == "docx" else "extract_text_from_pdf"
+            parser = extract_text_from_docx if entry["format"] == "docx" else extract_text_from_pdf
+            text = timer.time(parse_stage, parser, data)
+            resume_data = timer.time("extract_entities", extract_entities, text, segment=True)
+            years = timer.time("extract_years_of_experience", extract_years_of_experience, text)
+            match_rate, matched, missing = timer.time("semantic_match", semantic_match, resume_data["skills"], skills)
+            timer.time("calculate_scores", calculate_scores, match_rate, years, 2)
+            generate_explanation("Candidate", matched, missing, years, 2)
+
+            elapsed = time.perf_counter() - doc_start
+            timer.samples.setdefault("end_to_end", []).append(elapsed)
+            by_size.samples.setdefault(entry["size"], []).append(elapsed)
+    wall_s = time.perf_counter() - wall_start
+
+    # Every available PDF backend on the same PDFs, outside the end-to-end timing
+    pdf_backends = StageTimer()
+    for backend in available_pdf_backends():
+        for entry, data in resumes:
+            if entry["format"] == "pdf":
+                pdf_backends.time(backend, extract_text_from_pdf, data, backend=backend)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "inference_backend": os.getenv("INFERENCE_BACKEND", "torch"),
+            "pdf_backend": PDF_BACKEND,
+            "corpus": corpus_dir,
+            "documents": len(resumes),
+            "repeat": repeat
+        },
+        "model_load_s": round(model_load_s, 3),
+        "wall_s": round(wall_s, 3),
+        "documents_per_s": round(len(resumes) * repeat / wall_s, 3) if wall_s else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.report(),
+        "end_to_end_by_size": by_size.report(),
+        "pdf_backends": pdf_backends.report()
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Stages whose p50/p95 regressed by more than `tolerance` (fraction) vs the baseline"""
+    regressions = []
+    for stage, stats in report["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if base[key] and stats[key] > base[key] * (1 + tolerance):
+                regressions.append({
+                    "stage": stage,
+                    "metric": key,
+                    "baseline": base[key],
+                    "current": stats[key],
+                    "change": round(stats[key] / base[key] - 1, 3)
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--resumes", type=int, default=30, help="corpus size if it has to be generated")
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", help="write the JSON report here as well as stdout")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown, e.g. 0.15 = 15%%")
+    parser.add_argument("--save-baseline", help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(args.corpus, "manifest.json")):
+        from benchmarks.corpus import generate_corpus
+        generate_corpus(args.corpus, args.resumes, args.jds)
+
+    # Keep stdout clean for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_benchmark(args.corpus, args.repeat, args.warmup)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+Multi-worker serving with one copy of the model weights.
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+The master imports the app, loads GLiNER + MiniLM and freezes the GC before
+forking WEB_CONCURRENCY uvicorn workers. The weights are then shared
+copy-on-write: workers only read parameter tensors, and with gc.freeze the
+collector never writes to the pages of the preloaded objects. Check the
+per-worker cost with `python -m app.memory <master pid>` or GET /memory
+(compare PSS / private, not RSS).
+"""
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:80")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+preload_app = True
+
+
+def when_ready(server):
+    import torch
+    from app.model_bundle import warmup
+
+    # No intra-op thread pool in the master: OpenMP pools do not survive fork.
+    # Workers size their own pools (TORCH_THREADS) in the inference threads.
+    torch.set_num_threads(1)
+    warmup()
+    gc.collect()
+    gc.freeze()
+    server.log.info("Models preloaded in master %s, forking %s workers", os.getpid(), workers)
@@ -0,0 +1,107 @@
+import json
+import zlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("sentence_transformers")
+
+from app import candidate_index  # noqa: E402
+from app.candidate_index import CandidateIndex  # noqa: E402
+
+
+def _fake_encode(skills):
+    # One fixed random vector per skill name, no model needed
+    return np.stack([
+        np.random.default_rng(zlib.crc32(skill.encode())).standard_normal(16).astype(np.float32)
+        for skill in skills
+    ])
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(candidate_index, "encode_skills", _fake_encode)
+
+
+def _fill(index):
+    index.add("alice", ["python", "django", "postgres"], 5.0, name="Alice")
+    index.add("bob", ["java", "spring framework"], 3.0)
+    index.add("carol", ["excel", "tableau"], 1.0)
+
+
+def _journal_lines(directory):
+    with open(directory / "candidates.log", "rb") as f:
+        return f.read().splitlines()
+
+
+def test_add_search_remove_round_trip(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    _fill(index)
+    assert len(index) == 3
+    assert index.search(["python", "django"], k=1)[0][0] == "alice"
+    assert index.search(["python"], k=0) == []
+
+    assert index.remove("bob")
+    assert not index.remove("bob")
+    assert sorted(candidate_id for candidate_id, _ in index.entries()) == ["alice", "carol"]
+    assert "bob" not in [candidate_id for candidate_id, _ in index.search(["java"], k=10)]
+
+    # Re-adding replaces the entry instead of duplicating it
+    index.add("alice", ["tableau"], 7.0)
+    assert len(index) == 2
+    assert dict(index.entries())["alice"]["experience"] == 7.0
+
+
+def test_reopen_from_snapshot_and_journal(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    _fill(index)
+    index.save()
+    index.remove("carol")
+    index.add("dave", ["python", "postgres"], 2.0)
+    assert len(_journal_lines(tmp_path)) == 2
+
+    reopened = CandidateIndex(str(tmp_path))
+    assert dict(reopened.entries()).keys() == dict(index.entries()).keys()
+    assert dict(reopened.entries())["alice"]["name"] == "Alice"
+    assert reopened.search(["python", "postgres"], k=4) == index.search(["python", "postgres"], k=4)
+
+
+def test_torn_journal_line_is_dropped(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    _fill(index)
+    with open(tmp_path / "candidates.log", "ab") as f:
+        f.write(b'{"op": "add", "candidate_id": "half')
+
+    reopened = CandidateIndex(str(tmp_path))
+    assert len(reopened) == 3
+    # The next write truncates the torn tail before appending
+    reopened.add("erin", ["go"], 4.0)
+    lines = _journal_lines(tmp_path)
+    assert [json.loads(line)["candidate_id"] for line in lines] == ["alice", "bob", "carol", "erin"]
+    assert len(CandidateIndex(str(tmp_path))) == 4
+
+
+def test_journal_is_compacted_at_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_index, "CANDIDATE_JOURNAL_MAX", 3)
+    index = CandidateIndex(str(tmp_path))
+    _fill(index)
+    assert _journal_lines(tmp_path) == []
+    assert (tmp_path / "candidates.faiss").exists()
+
+    index.remove("alice")
+    assert len(_journal_lines(tmp_path)) == 1
+    assert sorted(dict(CandidateIndex(str(tmp_path)).entries())) == ["bob", "carol"]
+
+
+def test_other_instances_catch_up(tmp_path):
+    writer = CandidateIndex(str(tmp_path))
+    reader = CandidateIndex(str(tmp_path))
+    _fill(writer)
+    assert len(reader) == 3
+
+    writer.save()  # new snapshot: the reader reloads instead of replaying
+    writer.remove("alice")
+    assert sorted(dict(reader.entries())) == ["bob", "carol"]
+    reader.add("frank", ["rust"], 1.0)
+    assert len(writer) == 3
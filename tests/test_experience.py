@@ -0,0 +1,39 @@
+from datetime import date
+
+from app.experience import merge_intervals, scan_experience, total_years_of_experience
+
+TODAY = date(2026, 10, 17)
+
+
+def test_adjacent_ranges_merge_up_to_today():
+    text = "Backend Engineer, Jun 2015 – Aug 2018. Senior Engineer, Sep 2018 – Present."
+    assert total_years_of_experience(text, today=TODAY) == 11.4
+    assert len(scan_experience(text, today=TODAY)["intervals"]) == 1
+
+
+def test_overlapping_ranges_are_not_double_counted():
+    text = "Acme 2015 - 2019, freelance 2017 - 2020"
+    assert total_years_of_experience(text, today=TODAY) == 5.0
+
+
+def test_numeric_months_include_the_end_month():
+    assert total_years_of_experience("06/2015 to 05/2016", today=TODAY) == 1.0
+
+
+def test_explicit_years_win_over_shorter_tenure():
+    text = "8+ years of Python. Acme, Jan 2022 - Dec 2022"
+    assert total_years_of_experience(text, today=TODAY) == 8.0
+
+
+def test_future_end_dates_are_capped_at_today():
+    assert total_years_of_experience("Sep 2025 - Sep 2030", today=TODAY) == 1.2
+
+
+def test_tenure_text_excludes_education_dates():
+    text = "Education: BSc, 2008 - 2012. Experience: Acme, 2020 - 2022"
+    assert total_years_of_experience(text, today=TODAY) == 6.0
+    assert total_years_of_experience(text, today=TODAY, tenure_text="Acme, 2020 - 2022") == 2.0
+
+
+def test_merge_intervals():
+    assert merge_intervals([(10, 20), (0, 5), (5, 8), (15, 30)]) == [(0, 8), (10, 30)]
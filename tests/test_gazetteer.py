@@ -0,0 +1,62 @@
+from app.gazetteer import SkillGazetteer, get_gazetteer, load_capitalised_forms, load_taxonomy
+
+SURFACE_FORMS = {
+    "java": "java",
+    "javascript": "javascript",
+    "js": "javascript",
+    "machine learning": "machine learning",
+    "ml": "machine learning",
+    "learning systems": "learning systems",
+    "c++": "c++",
+    "excel": "microsoft excel",
+}
+
+
+def _found(gazetteer, text):
+    return [surface for _, _, surface, _ in gazetteer.find(text)]
+
+
+def test_longest_match_wins_at_the_same_start():
+    gazetteer = SkillGazetteer(SURFACE_FORMS)
+    assert _found(gazetteer, "JavaScript and Java") == ["javascript", "java"]
+
+
+def test_leftmost_match_wins_on_overlap():
+    gazetteer = SkillGazetteer(SURFACE_FORMS)
+    assert _found(gazetteer, "Machine Learning Systems") == ["machine learning"]
+
+
+def test_matches_need_word_boundaries():
+    gazetteer = SkillGazetteer(SURFACE_FORMS)
+    assert _found(gazetteer, "Javanese HTML, jsonschema") == []
+    assert gazetteer.extract("Skills: ML, JS; C++.") == {"machine learning", "javascript", "c++"}
+
+
+def test_offsets_refer_to_whitespace_normalised_text():
+    gazetteer = SkillGazetteer(SURFACE_FORMS)
+    assert gazetteer.find("  machine\n  learning ") == [(0, 16, "machine learning", "machine learning")]
+
+
+def test_capitalised_forms_skip_ordinary_words():
+    gazetteer = SkillGazetteer(SURFACE_FORMS, capitalised={"excel"})
+    assert gazetteer.extract("I excel at teamwork") == set()
+    assert gazetteer.extract("Reporting in Excel and EXCEL") == {"microsoft excel"}
+
+
+def test_taxonomy_file(tmp_path):
+    path = tmp_path / "skills.txt"
+    path.write_text("# comment\nMicrosoft Excel|MS  Excel|~excel\npython|python3\n", encoding="utf-8")
+    assert load_taxonomy(str(path)) == {
+        "microsoft excel": "microsoft excel",
+        "ms excel": "microsoft excel",
+        "excel": "microsoft excel",
+        "python": "python",
+        "python3": "python",
+    }
+    assert load_capitalised_forms(str(path)) == {"excel"}
+    assert SkillGazetteer.from_file(str(path)).extract("python3, excel") == {"python"}
+
+
+def test_default_taxonomy_ignores_common_words():
+    skills = get_gazetteer().extract("I excel at spring cleaning and check my outlook daily. Python, Excel.")
+    assert skills == {"python", "microsoft excel"}
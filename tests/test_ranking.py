@@ -0,0 +1,59 @@
+import math
+
+import pytest
+
+from app.ranking import CandidateTable, rank
+from app.scoring import calculate_scores
+
+CANDIDATES = [
+    ("a", 0.75, 1.0, True),
+    ("b", 0.5, 6.0, False),
+    ("c", 1.0, 0.0, True),
+    ("d", 0.25, 2.5, False),
+    ("e", 0.0, 10.0, True),
+    ("f", 0.6, 3.0, False),
+]
+
+
+def _table():
+    ids, rates, years, education = zip(*CANDIDATES)
+    return CandidateTable(ids, rates, years, education)
+
+
+@pytest.mark.parametrize("required_exp", [0, 2, 3.5])
+def test_default_weights_match_calculate_scores(required_exp):
+    expected = {
+        candidate_id: calculate_scores(rate, years, required_exp)
+        for candidate_id, rate, years, _ in CANDIDATES
+    }
+    expected_order = sorted(expected, key=lambda c: (-expected[c]["overall_score"], c))
+
+    results = rank(_table(), required_exp=required_exp)
+    assert [r["candidate_id"] for r in results] == expected_order
+    for result in results:
+        assert result["scores"] == expected[result["candidate_id"]]
+
+
+def test_top_k_is_a_prefix_of_the_full_ranking():
+    full = rank(_table(), required_exp=3)
+    assert rank(_table(), required_exp=3, k=2) == full[:2]
+    assert rank(_table(), required_exp=3, k=0) == []
+    assert rank(CandidateTable([], [], [], [])) == []
+
+
+def test_custom_weights_include_education():
+    results = rank(_table(), {"education": 1.0}, k=3)
+    assert [r["candidate_id"] for r in results] == ["a", "c", "e"]
+    assert results[0]["scores"]["education_score"] == 100.0
+
+
+@pytest.mark.parametrize("weights", [
+    {"skill": math.nan},
+    {"skill": math.inf},
+    {"experience": -0.5},
+    {"skill": 1e308, "experience": 1e308},
+    {"seniority": 1.0},
+])
+def test_invalid_weights_are_rejected(weights):
+    with pytest.raises(ValueError):
+        rank(_table(), weights)
@@ -0,0 +1,61 @@
+import pytest
+
+from app.sections import MIN_SECTIONS, section_text, segment_resume, split_items
+
+TECH_RESUME = (
+    "Jane Doe\nTECHNICAL SKILLS\nLanguages: Python, Java, Rust\nTools: Jenkins\n"
+    "EXPERIENCE\nAcme, 2019 - 2023\nLANGUAGES\nEnglish, French"
+)
+
+
+def _names(text):
+    return [section.name for section in segment_resume(text)]
+
+
+def test_letter_spaced_headings():
+    text = "Jane Doe\nS K I L L S\nPython, SQL\nE X P E R I E N C E\nAcme, 2019 - 2023"
+    assert _names(text) == ["header", "skills", "experience"]
+    assert section_text(text, "skills") == "Python, SQL"
+
+
+def test_colon_headings_in_title_case():
+    text = "Jane Doe Skills: Python, SQL Work Experience: Acme, 2019 - 2023 Education: BSc"
+    assert _names(text) == ["header", "skills", "experience", "education"]
+    assert section_text(text, "experience") == "Acme, 2019 - 2023"
+
+
+def test_capitalised_headings_on_one_flattened_line():
+    text = "Jane Doe PROFESSIONAL SUMMARY Backend engineer. TECHNICAL SKILLS Python, Kafka"
+    assert _names(text) == ["header", "summary", "skills"]
+    assert section_text(text, "skills") == "Python, Kafka"
+
+
+def test_title_case_words_in_running_text_are_not_headings():
+    text = "Skills:\nPython\nExperience:\nBuilt services with Experience in Kafka and Education tooling"
+    assert _names(text) == ["skills", "experience"]
+
+
+def test_colon_sub_headings_stay_in_a_capitalised_section():
+    assert _names(TECH_RESUME) == ["header", "skills", "experience", "languages"]
+    assert section_text(TECH_RESUME, "skills") == "Languages: Python, Java, Rust\nTools: Jenkins"
+    assert section_text(TECH_RESUME, "languages") == "English, French"
+
+
+def test_unrouted_sections_reach_ner_with_every_label():
+    pytest.importorskip("torch")
+    from app.ner_model import SECTION_LABELS, labels, ner_inputs
+
+    inputs = ner_inputs(TECH_RESUME)
+    assert "".join(body for _, body, _ in inputs).count("Python, Java, Rust") == 1
+    assert [section_labels for _, body, section_labels in inputs if "English" in body] == [labels]
+    assert "languages" not in SECTION_LABELS
+
+
+def test_fewer_than_min_sections_is_one_block():
+    assert MIN_SECTIONS == 2
+    assert segment_resume("We need Python and AWS. Skills: Python, AWS") == ()
+    assert section_text("Skills: Python, AWS", "skills") is None
+
+
+def test_split_items():
+    assert split_items("Python, SQL; Docker | AWS\n• Kafka") == ["Python", "SQL", "Docker", "AWS", "Kafka"]
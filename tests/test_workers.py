@@ -0,0 +1,43 @@
+import asyncio
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app import workers
+
+
+@pytest.fixture
+def pdf_pool(monkeypatch):
+    monkeypatch.setattr(workers, "PDF_WORKERS", 1)
+    workers.shutdown()
+    yield
+    workers.shutdown()
+
+
+def test_parse_survives_a_killed_worker(pdf_pool):
+    async def scenario():
+        pid = await workers.run_parse(os.getpid)
+        os.kill(pid, 9)
+        # The dead worker breaks the pool; the parse is retried on a new one
+        return pid, await workers.run_parse(os.getpid)
+
+    old_pid, new_pid = asyncio.run(scenario())
+    assert new_pid != old_pid
+
+
+def test_parse_that_keeps_crashing_returns_503(pdf_pool):
+    async def scenario():
+        with pytest.raises(HTTPException) as error:
+            await workers.run_parse(os.abort)
+        assert error.value.status_code == 503
+        return await workers.run_parse(len, b"still parsing")
+
+    assert asyncio.run(scenario()) == 13
+
+
+def test_batch_timeout_grows_with_the_documents(monkeypatch):
+    monkeypatch.setattr(workers, "REQUEST_TIMEOUT", 60.0)
+    monkeypatch.setattr(workers, "DOCUMENT_TIMEOUT", 5.0)
+    assert workers.batch_timeout(1) == 60.0
+    assert workers.batch_timeout(201) == 1060.0